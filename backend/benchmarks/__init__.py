@@ -0,0 +1,3 @@
+"""
+Benchmarks for the scheduling backend. Run from backend/, e.g. `python -m benchmarks.suite`.
+"""
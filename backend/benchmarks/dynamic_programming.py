@@ -0,0 +1,87 @@
+"""
+Compare the /api/dynamic-programming solvers against the greedy scorer.
+
+The greedy baseline walks tasks in /api/greedy order and keeps each one
+that still fits in the budget and before its deadline. The knapsack is
+exact for the same constraints, so its value is an upper bound on greedy.
+Interval scheduling solves the fixed-window variant of the problem, so its
+value is only comparable with itself across sizes.
+
+    python -m benchmarks.dynamic_programming --sizes 100 1000 5000 --budget 480
+"""
+import argparse
+import time
+
+import numpy as np
+
+from routers.dynamic_programming import deadline_knapsack, weighted_interval_scheduling
+from routers.greedy_engine import compute_values, plan_schedule
+
+LEVELS = 3  # high / medium / low encoded as 3..1
+
+
+def generate(size: int, budget: int, seed: int):
+    """Seeded synthetic tasks as arrays: priority, energy, minutes, deadline and a fixed window."""
+    rng = np.random.default_rng(seed)
+    priority = rng.integers(1, LEVELS + 1, size)
+    energy = rng.integers(1, LEVELS + 1, size)
+    durations = rng.integers(5, 121, size)
+    # A third of the tasks have no deadline inside the budget
+    deadlines = np.where(rng.random(size) < 0.33, budget, rng.integers(0, budget * 2, size))
+    starts = rng.integers(0, budget, size)
+    ends = np.minimum(starts + durations, budget)
+    return priority, energy, durations, deadlines, starts, ends
+
+
+def greedy_within_budget(priority, energy, durations, deadlines, values, budget):
+    order = plan_schedule(priority, energy, durations).order
+    elapsed = 0
+    total = 0
+    for index in order.tolist():
+        finish = elapsed + int(durations[index])
+        if finish <= min(budget, int(deadlines[index])):
+            elapsed = finish
+            total += int(values[index])
+    return total
+
+
+def timed(repeat: int, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - started)
+    return result, best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--budget", type=int, default=480, help="minutes available")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case, best time is reported")
+    args = parser.parse_args()
+
+    print(f"{'tasks':>7} {'solver':>9} {'value':>8} {'vs greedy':>10} {'ms':>9}")
+    for size in args.sizes:
+        priority, energy, durations, deadlines, starts, ends = generate(size, args.budget, args.seed)
+        values = compute_values(priority, energy)
+
+        greedy_value, greedy_ms = timed(
+            args.repeat, greedy_within_budget, priority, energy, durations, deadlines, values, args.budget
+        )
+        knapsack, knapsack_ms = timed(args.repeat, deadline_knapsack, durations, deadlines, values, args.budget)
+        interval, interval_ms = timed(args.repeat, weighted_interval_scheduling, starts, ends, values)
+
+        for name, value, ms in (
+            ("greedy", greedy_value, greedy_ms),
+            ("knapsack", knapsack.total_value, knapsack_ms),
+            ("interval", interval.total_value, interval_ms),
+        ):
+            ratio = value / greedy_value if greedy_value else float("nan")
+            print(f"{size:>7} {name:>9} {value:>8} {ratio:>9.2f}x {ms:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Seeded synthetic inputs for the benchmarks.
+
+The same (size, seed) always yields the same tasks, so results from two
+runs, or two commits, measure the same work.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+LEVELS = np.array(["low", "medium", "high"])
+
+
+def schedule_tasks(size: int, seed: int, origin: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Tasks in the /api/greedy payload shape; half of them have a due_date within a week."""
+    rng = np.random.default_rng(seed)
+    origin = origin or datetime.now()
+    priority = LEVELS[rng.integers(0, 3, size)].tolist()
+    energy = LEVELS[rng.integers(0, 3, size)].tolist()
+    estimates = rng.integers(5, 241, size).tolist()
+    due_minutes = rng.integers(30, 7 * 24 * 60, size).tolist()
+    has_due = (rng.random(size) < 0.5).tolist()
+    return [
+        {
+            "id": f"task-{i}",
+            "name": f"Task {i}",
+            "priority": priority[i],
+            "time_estimate": estimates[i],
+            "energy_level": energy[i],
+            "due_date": (origin + timedelta(minutes=due_minutes[i])).isoformat() if has_due[i] else None,
+        }
+        for i in range(size)
+    ]
+
+
+def analysis_tasks(size: int, seed: int, origin: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Tasks in the shape analyze_tasks reads: title, duration in hours, due_date, priority, energy."""
+    return [
+        {
+            "title": task["name"],
+            "duration": task["time_estimate"] / 60,
+            "due_date": task["due_date"],
+            "priority": task["priority"],
+            "energy": task["energy_level"],
+        }
+        for task in schedule_tasks(size, seed, origin)
+    ]
+
+
+def stored_tasks(size: int, seed: int, origin: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Task rows for TaskService.create_tasks: name, importance 1..3, duration in minutes, deadline."""
+    origin = origin or datetime.now()
+    return [
+        {
+            "name": task["name"],
+            "importance": {"low": 1, "medium": 2, "high": 3}[task["priority"]],
+            "duration": task["time_estimate"],
+            "deadline": datetime.fromisoformat(task["due_date"]) if task["due_date"] else None,
+        }
+        for task in schedule_tasks(size, seed, origin)
+    ]
+
+
+def dependency_edges(size: int, density: float, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    A random DAG with about `density` dependencies per task, as (src, dst)
+    index arrays where src must finish before dst. Every edge points from a
+    lower to a higher index, so the graph is acyclic; duplicates are dropped.
+    """
+    if size < 2 or density <= 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    rng = np.random.default_rng(seed + 1)
+    count = int(size * density)
+    src = rng.integers(0, size - 1, count)
+    dst = src + 1 + (rng.random(count) * (size - 1 - src)).astype(np.int64)
+    unique = np.unique(src * size + dst)
+    return unique // size, unique % size
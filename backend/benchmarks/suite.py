@@ -0,0 +1,209 @@
+"""
+Benchmark suite for the scheduling backend, with results saved as JSON.
+
+Cases, each run on seeded synthetic inputs (see benchmarks.generators):
+
+    greedy            /api/greedy handler, from the raw JSON body to the
+                      serialized response, split into its marked stages
+    analyze_tasks     efficient-selection analysis of the given tasks
+    topological_sort  TaskGraph build over a random DAG of each density
+    get_schedule      TaskService.get_schedule on a local SQLite file,
+                      for one user with a random DAG of each density
+
+Every case reports the best and median wall time over --repeat runs and
+the per-stage times (from the same marks as the Server-Timing header) of
+the fastest run. --compare reads an earlier --output file and exits with
+status 1 if any case got slower than --threshold.
+
+Run from backend/:
+
+    python -m benchmarks.suite --sizes 1000 10000 100000 --output bench.json
+    python -m benchmarks.suite --sizes 1000000 --cases greedy analyze_tasks
+    python -m benchmarks.suite --compare bench.json
+"""
+import argparse
+import asyncio
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+import orjson
+from starlette.requests import Request
+
+from benchmarks import generators
+from database import create_engine, create_tables, session_factory
+from routers.efficient_selection import analyze_tasks
+from routers.greedy_scheduler import greedy_schedule
+from routers.models import ScheduleRequest, Task
+from routers.timing import collect_stages, mark_stage
+from routers.topological_sort import TaskGraph
+from services.task_service import TaskService
+
+# Stand-in for the HTTP request greedy_schedule reads its Accept header from
+JSON_REQUEST = Request({"type": "http", "headers": []})
+
+
+async def measure(repeat: int, run: Callable[[], Awaitable[Any]]) -> Dict[str, Any]:
+    """Time `run` `repeat` times; stage times come from the fastest run."""
+    times, best_stages = [], {}
+    for _ in range(repeat):
+        with collect_stages() as timer:
+            await run()
+        elapsed = time.perf_counter() - timer.started
+        if not times or elapsed < min(times):
+            best_stages = timer.totals()
+        times.append(elapsed)
+    return {
+        "best_ms": round(min(times) * 1000, 3),
+        "median_ms": round(statistics.median(times) * 1000, 3),
+        "stages_ms": {name: round(seconds * 1000, 3) for name, seconds in best_stages.items()},
+    }
+
+
+async def bench_greedy(size: int, density: float, args) -> Dict[str, Any]:
+    body = orjson.dumps({"tasks": generators.schedule_tasks(size, args.seed)})
+
+    async def run():
+        # greedy_schedule marks the end of "validation" on entry
+        await greedy_schedule(ScheduleRequest.model_validate_json(body), JSON_REQUEST)
+
+    return await measure(args.repeat, run)
+
+
+async def bench_analyze_tasks(size: int, density: float, args) -> Dict[str, Any]:
+    tasks = generators.analysis_tasks(size, args.seed)
+
+    async def run():
+        analyze_tasks(tasks)
+        mark_stage("analysis")
+
+    return await measure(args.repeat, run)
+
+
+async def bench_topological_sort(size: int, density: float, args) -> Dict[str, Any]:
+    tasks = [Task(**task) for task in generators.schedule_tasks(size, args.seed)]
+    src, dst = generators.dependency_edges(size, density, args.seed)
+
+    async def run():
+        TaskGraph(tasks, src, dst)
+        mark_stage("graph")
+
+    return await measure(args.repeat, run)
+
+
+async def bench_get_schedule(size: int, density: float, args) -> Dict[str, Any]:
+    directory = tempfile.mkdtemp(prefix="habitify-bench-")
+    engine = create_engine(f"sqlite+aiosqlite:///{os.path.join(directory, 'bench.db')}")
+    sessions = session_factory(engine)
+    user_id = uuid.UUID(int=args.seed)
+
+    async def run():
+        async with sessions() as db:
+            await TaskService(db).get_schedule(user_id)
+
+    try:
+        await create_tables(engine)
+        async with sessions() as db:
+            service = TaskService(db)
+            tasks = await service.create_tasks(user_id, generators.stored_tasks(size, args.seed))
+            src, dst = generators.dependency_edges(size, density, args.seed)
+            if src.size:
+                await service.add_dependencies([
+                    (tasks[after].id, tasks[before].id) for before, after in zip(src.tolist(), dst.tolist())
+                ])
+        return await measure(args.repeat, run)
+    finally:
+        await engine.dispose()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+CASES = {
+    "greedy": (bench_greedy, False),
+    "analyze_tasks": (bench_analyze_tasks, False),
+    "topological_sort": (bench_topological_sort, True),
+    "get_schedule": (bench_get_schedule, True),
+}
+
+
+def case_key(result: Dict[str, Any]) -> tuple:
+    return result["case"], result["size"], result["density"]
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str, threshold: float) -> bool:
+    """Print each case's change against the baseline; True if any is a regression."""
+    with open(baseline_path, "rb") as f:
+        baseline = {case_key(result): result for result in orjson.loads(f.read())["results"]}
+    regressed = False
+    print(f"\n{'case':>17} {'size':>8} {'density':>7} {'before':>10} {'after':>10} {'change':>8}")
+    for result in results:
+        before = baseline.get(case_key(result))
+        if before is None:
+            continue
+        change = result["best_ms"] / before["best_ms"] - 1 if before["best_ms"] else 0.0
+        flag = "  REGRESSED" if change > threshold else ""
+        regressed |= change > threshold
+        print(
+            f"{result['case']:>17} {result['size']:>8} {result['density']:>7} "
+            f"{before['best_ms']:>10.2f} {result['best_ms']:>10.2f} {change:>+7.1%}{flag}"
+        )
+    return regressed
+
+
+async def main_async(args) -> int:
+    results = []
+    print(f"{'case':>17} {'size':>8} {'density':>7} {'best ms':>10} {'median ms':>10}  stages")
+    for name in args.cases:
+        bench, uses_density = CASES[name]
+        sizes = args.db_sizes if name == "get_schedule" else args.sizes
+        for size in sizes:
+            for density in args.densities if uses_density else [0.0]:
+                result = {"case": name, "size": size, "density": density}
+                result.update(await bench(size, density, args))
+                results.append(result)
+                stages = " ".join(f"{stage}={ms:.1f}" for stage, ms in result["stages_ms"].items())
+                print(f"{name:>17} {size:>8} {density:>7} {result['best_ms']:>10.2f} {result['median_ms']:>10.2f}  {stages}")
+
+    if args.output:
+        report = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.output, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        print(f"\nwrote {args.output}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--db-sizes", type=int, nargs="+", default=[1000, 10000], help="task counts for get_schedule")
+    parser.add_argument("--densities", type=float, nargs="+", default=[0.0, 1.0, 4.0], help="dependencies per task")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier --output run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="slowdown that counts as a regression")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main_async(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+Database models and async session factory for the task service.
+"""
+from .models import Base, Task, TaskDependency
+from .session import create_engine, create_tables, get_session, session_factory
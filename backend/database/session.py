@@ -0,0 +1,55 @@
+"""
+Async engine and session factory.
+
+Configured from the environment so the same code runs against Postgres in
+production and a local SQLite file (through aiosqlite) in development:
+
+    DATABASE_URL      sqlalchemy URL, default sqlite+aiosqlite:///./habitify.db
+    DB_POOL_SIZE      connections kept open (default 5)
+    DB_MAX_OVERFLOW   extra connections allowed under burst load (default 10)
+    DB_POOL_TIMEOUT   seconds to wait for a free connection (default 30)
+    DB_POOL_RECYCLE   seconds before a connection is replaced (default 1800)
+"""
+import os
+from typing import AsyncIterator, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from .models import Base
+
+DEFAULT_DATABASE_URL = "sqlite+aiosqlite:///./habitify.db"
+
+
+def create_engine(url: Optional[str] = None, **overrides) -> AsyncEngine:
+    url = url or os.environ.get("DATABASE_URL", DEFAULT_DATABASE_URL)
+    options = {"pool_pre_ping": True}
+    # In-memory SQLite lives in a single connection, so it gets no pool settings
+    if ":memory:" not in url:
+        options.update(
+            pool_size=int(os.environ.get("DB_POOL_SIZE", 5)),
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", 10)),
+            pool_timeout=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+            pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", 1800)),
+        )
+    options.update(overrides)
+    return create_async_engine(url, **options)
+
+
+def session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    # Committed objects stay readable, so cache patches after commit need no refresh query
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+async def create_tables(engine: AsyncEngine) -> None:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+
+engine = create_engine()
+SessionLocal = session_factory(engine)
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """FastAPI dependency yielding one session per request."""
+    async with SessionLocal() as session:
+        yield session
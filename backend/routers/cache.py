@@ -0,0 +1,78 @@
+"""
+Small in-process caches shared by the scheduling routers.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+
+class LRUCache(Generic[V]):
+    """
+    Mapping bounded to `maxsize` entries, evicting the least recently used one.
+
+    With a `ttl` (seconds) entries also expire; `put` can shorten the lifetime
+    of a single entry. Expired entries are dropped when they are next looked up.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None, timer: Callable[[], float] = time.monotonic):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._timer = timer
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], V]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Optional[V]:
+        entry = self._live_entry(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def peek(self, key: Hashable, default: Any = None) -> Optional[V]:
+        """Look up without refreshing the entry's recency or counting a hit."""
+        entry = self._live_entry(key)
+        return default if entry is None else entry[1]
+
+    def put(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        lifetimes = [t for t in (self.ttl, ttl) if t is not None]
+        expires_at = self._timer() + min(lifetimes) if lifetimes else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Optional[V]:
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _live_entry(self, key: Hashable) -> Optional[Tuple[Optional[float], V]]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and entry[0] <= self._timer():
+            del self._entries[key]
+            return None
+        return entry
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._live_entry(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
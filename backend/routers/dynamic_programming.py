@@ -0,0 +1,208 @@
+"""
+Exact schedulers for a daily time budget (/api/dynamic-programming).
+
+A task's value is its greedy score without the time penalty
+(3 * priority + 2 * energy), so longer tasks are not punished twice.
+"""
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from .greedy_engine import ENERGY_MAP, PRIORITY_MAP, compute_values, encode_levels, fill_scheduled_fields
+from .models import DynamicProgrammingRequest, DynamicProgrammingResponse, Task
+from .priority_queue import minutes_until
+from .responses import ORJSONResponse
+
+router = APIRouter()
+
+
+class Selection(NamedTuple):
+    indices: List[int]  # chosen tasks, in execution order
+    start_offsets: np.ndarray  # minutes from the origin
+    end_offsets: np.ndarray
+    total_value: int
+
+
+def task_values(tasks: Sequence[Task]) -> np.ndarray:
+    count = len(tasks)
+    return compute_values(
+        encode_levels((task.priority for task in tasks), PRIORITY_MAP, count),
+        encode_levels((task.energy_level for task in tasks), ENERGY_MAP, count),
+    )
+
+
+def weighted_interval_scheduling(
+    starts: np.ndarray, ends: np.ndarray, values: np.ndarray
+) -> Selection:
+    """
+    Highest-value set of non-overlapping intervals in O(n log n).
+
+    Intervals are sorted by end time, then start time; for each one the last
+    compatible interval (ending at or before its start) is found by binary
+    search over the sorted ends, then a single DP pass picks take/skip.
+    Breaking ties by start puts a zero-length interval after every interval
+    ending at its point, so all of its compatible intervals come before it.
+    """
+    order = np.lexsort((starts, ends))
+    sorted_starts, sorted_ends = starts[order], ends[order]
+    sorted_values = values[order].tolist()
+    count = len(order)
+    # compatible[j] = number of earlier intervals that end by interval j's start;
+    # the cap keeps a zero-length interval from counting itself or later ones
+    compatible = np.minimum(
+        np.searchsorted(sorted_ends, sorted_starts, side="right"), np.arange(count)
+    ).tolist()
+    best = [0] * (count + 1)
+    for j in range(count):
+        best[j + 1] = max(best[j], sorted_values[j] + best[compatible[j]])
+
+    chosen = []
+    j = count
+    while j > 0:
+        if sorted_values[j - 1] + best[compatible[j - 1]] > best[j - 1]:
+            chosen.append(j - 1)
+            j = compatible[j - 1]
+        else:
+            j -= 1
+    chosen.reverse()
+    chosen = np.asarray(chosen, dtype=np.int64)
+    return Selection(
+        indices=order[chosen].tolist(),
+        start_offsets=sorted_starts[chosen],
+        end_offsets=sorted_ends[chosen],
+        total_value=best[count],
+    )
+
+
+def deadline_knapsack(
+    durations: np.ndarray, deadlines: np.ndarray, values: np.ndarray, budget: int
+) -> Selection:
+    """
+    0/1 knapsack over minutes where every chosen task also finishes by its deadline.
+
+    Tasks are taken in deadline order, so a chosen set run back to back in that
+    order meets every deadline exactly when, at each step, the minutes used so
+    far fit under the current task's deadline. best[t] is the highest value
+    using exactly t minutes; it is one rolling array of budget + 1 entries,
+    updated with array slices per task. Which cells took the task is kept as
+    one packed bit row per task (n * budget / 8 bytes) for reconstruction.
+    """
+    order = np.argsort(deadlines, kind="stable")
+    unreachable = np.iinfo(np.int64).min // 2
+    best = np.full(budget + 1, unreachable, dtype=np.int64)
+    best[0] = 0
+    took = np.zeros((len(order), (budget + 1 + 7) // 8), dtype=np.uint8)
+    row = np.zeros(budget + 1, dtype=bool)
+
+    for step, index in enumerate(order.tolist()):
+        weight = int(durations[index])
+        limit = min(budget, int(deadlines[index]))
+        if weight < 0 or weight > limit:
+            continue
+        current = best[weight:limit + 1]
+        candidate = best[:limit + 1 - weight] + values[index]
+        taken = candidate > current
+        best[weight:limit + 1] = np.where(taken, candidate, current)
+        row[:] = False
+        row[weight:limit + 1] = taken
+        took[step] = np.packbits(row)
+
+    used = int(np.argmax(best))
+    total_value = int(best[used])
+
+    chosen = []
+    minutes = used
+    for step in range(len(order) - 1, -1, -1):
+        if took[step, minutes >> 3] & (0x80 >> (minutes & 7)):
+            index = int(order[step])
+            chosen.append(index)
+            minutes -= int(durations[index])
+    chosen.reverse()
+
+    chosen_durations = durations[np.asarray(chosen, dtype=np.int64)]
+    end_offsets = np.cumsum(chosen_durations)
+    return Selection(
+        indices=chosen,
+        start_offsets=end_offsets - chosen_durations,
+        end_offsets=end_offsets,
+        total_value=total_value,
+    )
+
+
+def _deadline_minutes(tasks: Sequence[Task], origin: datetime, budget: int) -> np.ndarray:
+    origin_utc = origin.astimezone(timezone.utc)
+    return np.fromiter(
+        (minutes_until(task.due_date, origin, origin_utc, budget) for task in tasks),
+        dtype=np.int64,
+        count=len(tasks),
+    )
+
+
+def _intervals(tasks: Sequence[Task], origin: datetime, budget: int):
+    """
+    Fixed windows for interval scheduling: start_time/end_time when given,
+    otherwise the latest slot ending at due_date. Tasks without either, or
+    whose window falls outside [now, now + budget], are left out.
+    """
+    origin_utc = origin.astimezone(timezone.utc)
+    indices, starts, ends = [], [], []
+    for i, task in enumerate(tasks):
+        if task.start_time is not None and task.end_time is not None:
+            start = minutes_until(task.start_time, origin, origin_utc, 0)
+            end = minutes_until(task.end_time, origin, origin_utc, 0)
+        elif task.due_date is not None:
+            end = minutes_until(task.due_date, origin, origin_utc, 0)
+            start = end - task.time_estimate
+        else:
+            continue
+        if 0 <= start <= end <= budget:
+            indices.append(i)
+            starts.append(start)
+            ends.append(end)
+    return (
+        np.asarray(indices, dtype=np.int64),
+        np.asarray(starts, dtype=np.int64),
+        np.asarray(ends, dtype=np.int64),
+    )
+
+
+@router.post("/dynamic-programming", response_model=DynamicProgrammingResponse)
+async def dynamic_programming_schedule(request: DynamicProgrammingRequest):
+    """
+    Pick the most valuable tasks that fit in `budget_minutes` (0 to 1440) from now.
+
+    "knapsack" (default) chooses any subset that can run back to back within
+    the budget with every task done before its due_date. "interval" keeps
+    tasks in their fixed windows and picks the best non-overlapping set.
+    """
+    try:
+        tasks = request.tasks
+        current_time = datetime.now()
+        budget = request.budget_minutes
+        values = task_values(tasks)
+
+        if request.algorithm == "interval":
+            indices, starts, ends = _intervals(tasks, current_time, budget)
+            selection = weighted_interval_scheduling(starts, ends, values[indices])
+            selection = selection._replace(indices=indices[selection.indices].tolist())
+        else:
+            durations = np.fromiter((task.time_estimate for task in tasks), dtype=np.int64, count=len(tasks))
+            selection = deadline_knapsack(durations, _deadline_minutes(tasks, current_time, budget), values, budget)
+
+        scheduled_tasks = fill_scheduled_fields(
+            [dict(tasks[i]) for i in selection.indices], current_time,
+            selection.start_offsets, selection.end_offsets,
+        )
+        used_minutes = int((selection.end_offsets - selection.start_offsets).sum())
+        return ORJSONResponse({
+            "algorithm": request.algorithm,
+            "scheduled_tasks": scheduled_tasks,
+            "total_value": selection.total_value,
+            "used_minutes": used_minutes,
+            "budget_minutes": budget,
+        })
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -1,20 +1,79 @@
-from datetime import datetime
-from typing import List, Dict, Any
-from fastapi import APIRouter, Depends
-from ..efficient_selection import analyze_tasks
-from .models import get_user_tasks  # You need to implement this to fetch tasks for the user
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Dict, Any, Optional
+from uuid import UUID
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_session
+from services.task_service import STORED_TASK_ENERGY, TaskService, importance_priority
+from .response_cache import conditional_json
+from .responses import ndjson_response, wants_ndjson
 
 router = APIRouter()
 
 @router.get("/efficient-selection")
-async def efficient_selection(user_id: str):
-    tasks = get_user_tasks(user_id)  # Fetch tasks from DB
-    analysis = analyze_tasks(tasks)
-    return {"analysis": analysis}
+async def efficient_selection(user_id: UUID, request: Request, db: AsyncSession = Depends(get_session)):
+    """
+    JSON responses carry an ETag and are cached per task-set version until
+    the next feasible -> impossible flip, so unchanged polls get a 304.
 
-def analyze_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    With `Accept: application/x-ndjson` each task's analysis is streamed as
+    one line, followed by a {"summary": {...}} line counting each status.
+    """
+    if wants_ndjson(request):
+        tasks = await get_user_tasks(db, user_id)
+        counts = Counter()
+        def counted(results: Iterator[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            for result in results:
+                counts[result["status"]] += 1
+                yield result
+        return ndjson_response(counted(iter_analysis(tasks)), lambda: dict(counts))
+
+    async def build():
+        tasks = await get_user_tasks(db, user_id)
+        now = datetime.now()
+        analysis = analyze_tasks(tasks)
+        flips_at = next_status_change(tasks, now)
+        return {"analysis": analysis}, (flips_at - now).total_seconds() if flips_at else None
+
+    return await conditional_json(request, "efficient-selection", user_id, build)
+
+async def get_user_tasks(db: AsyncSession, user_id: UUID) -> List[Dict[str, Any]]:
+    """The user's open tasks in the shape analyze_tasks reads (duration in hours, naive local due_date)."""
+    tasks = []
+    for task in await TaskService(db).get_user_tasks(user_id):
+        if task.status == "completed":
+            continue
+        deadline = task.deadline
+        if deadline is not None and deadline.tzinfo is not None:
+            deadline = deadline.astimezone().replace(tzinfo=None)
+        tasks.append({
+            "title": task.name,
+            "duration": task.duration / 60,
+            "due_date": deadline.isoformat() if deadline else None,
+            "priority": importance_priority(task.importance),
+            "energy": STORED_TASK_ENERGY,
+        })
+    return tasks
+
+def next_status_change(tasks: Iterable[Dict[str, Any]], now: datetime) -> Optional[datetime]:
+    """Earliest time after `now` at which a task stops fitting before its due date."""
+    upcoming = None
+    for task in tasks:
+        deadline_str = task.get("due_date")
+        if not deadline_str:
+            continue
+        flips_at = datetime.fromisoformat(deadline_str) - timedelta(hours=float(task.get("duration", 1)))
+        if flips_at > now and (upcoming is None or flips_at < upcoming):
+            upcoming = flips_at
+    return upcoming
+
+def analyze_tasks(tasks: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return list(iter_analysis(tasks))
+
+def iter_analysis(tasks: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Yield one suggestion per task, in input order."""
     now = datetime.now()
-    results = []
     for task in tasks:
         name = task["title"]
         duration = float(task.get("duration", 1))  # in hours
@@ -38,17 +97,16 @@ def analyze_tasks(tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
                     for i in range(int(duration))
                 ]
                 suggestion["subtasks"] = subtasks
-            results.append(suggestion)
+            yield suggestion
         elif priority == "low" or energy == "low":
-            results.append({
+            yield {
                 "task": name,
                 "status": "skip",
                 "reason": "Low priority or low energy"
-            })
+            }
         else:
-            results.append({
+            yield {
                 "task": name,
                 "status": "feasible",
                 "reason": f"Can be completed in time ({time_left:.2f}h left)"
-            })
-    return results
+            }
@@ -0,0 +1,132 @@
+"""
+Columnar scoring and ordering engine for the weighted greedy scheduler.
+
+Tasks are handled as parallel arrays (priority codes, energy codes and time
+estimates) so scoring, ordering and start/end offsets are computed with
+NumPy array operations instead of per-task Python objects.
+"""
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple
+
+import numpy as np
+
+from .timing import mark_stage
+
+# Assign numeric values
+PRIORITY_MAP = {"high": 3, "medium": 2, "low": 1}
+ENERGY_MAP = {"high": 3, "medium": 2, "low": 1}
+PRIORITY_WEIGHT = 3
+ENERGY_WEIGHT = 2
+TIME_WEIGHT = 1
+
+
+class GreedyPlan(NamedTuple):
+    order: np.ndarray  # task indices in scheduled order
+    start_offsets: np.ndarray  # minutes from schedule start, in scheduled order
+    end_offsets: np.ndarray
+    total_duration: int
+    makespan: int
+    efficiency_score: float
+
+
+def encode_levels(values: Iterable[str], mapping: dict, count: int = -1) -> np.ndarray:
+    """Map 'high'/'medium'/'low' labels to int codes, unknown labels count as 1."""
+    return np.fromiter((mapping.get(v, 1) for v in values), dtype=np.int64, count=count)
+
+
+def compute_scores(priority: np.ndarray, energy: np.ndarray, time_estimate: np.ndarray) -> np.ndarray:
+    return PRIORITY_WEIGHT * priority + ENERGY_WEIGHT * energy - TIME_WEIGHT * time_estimate
+
+
+def compute_values(priority: np.ndarray, energy: np.ndarray) -> np.ndarray:
+    """Benefit of finishing a task: the greedy score without the time penalty."""
+    return PRIORITY_WEIGHT * priority + ENERGY_WEIGHT * energy
+
+
+def score_task(priority: str, energy_level: str, time_estimate: int) -> int:
+    """Scalar version of compute_scores for single-task updates."""
+    return (
+        PRIORITY_WEIGHT * PRIORITY_MAP.get(priority, 1)
+        + ENERGY_WEIGHT * ENERGY_MAP.get(energy_level, 1)
+        - TIME_WEIGHT * time_estimate
+    )
+
+
+def greedy_order(scores: np.ndarray) -> np.ndarray:
+    """Indices sorted by score descending, ties keep their input order."""
+    return np.argsort(-scores, kind="stable")
+
+
+def plan_schedule(priority: np.ndarray, energy: np.ndarray, time_estimate: np.ndarray) -> GreedyPlan:
+    scores = compute_scores(priority, energy, time_estimate)
+    mark_stage("scoring")
+    order = greedy_order(scores)
+    durations = time_estimate[order]
+    end_offsets = np.cumsum(durations)
+    start_offsets = end_offsets - durations
+    mark_stage("sorting")
+
+    count = len(order)
+    total_duration = int(end_offsets[-1]) if count else 0
+    efficiency_score = int(priority.sum()) / count if count else 0.0
+    return GreedyPlan(
+        order=order,
+        start_offsets=start_offsets,
+        end_offsets=end_offsets,
+        total_duration=total_duration,
+        makespan=total_duration,
+        efficiency_score=float(efficiency_score),
+    )
+
+
+def offsets_to_datetimes(origin: datetime, offsets: np.ndarray) -> List[datetime]:
+    """Convert minute offsets from a naive origin into datetime objects."""
+    base = np.datetime64(origin, "us")
+    return (base + offsets.astype("timedelta64[m]")).astype("datetime64[us]").tolist()
+
+
+def fill_scheduled_fields(
+    rows: List[Dict[str, Any]], origin: datetime, start_offsets: np.ndarray, end_offsets: np.ndarray
+) -> List[Dict[str, Any]]:
+    """Add the ScheduledTask fields to `rows` (already in scheduled order)."""
+    starts = offsets_to_datetimes(origin, start_offsets)
+    ends = offsets_to_datetimes(origin, end_offsets)
+    for row, scheduled_start, scheduled_end in zip(rows, starts, ends):
+        row["scheduled_start"] = scheduled_start
+        row["scheduled_end"] = scheduled_end
+        row["completion_status"] = "pending"
+    return rows
+
+
+def iter_scheduled_rows(
+    rows: Iterable[Dict[str, Any]],
+    origin: datetime,
+    start_offsets: np.ndarray,
+    end_offsets: np.ndarray,
+    chunk_size: int = 512,
+) -> Iterator[Dict[str, Any]]:
+    """Lazy fill_scheduled_fields: only `chunk_size` rows are materialized at a time."""
+    rows = iter(rows)
+    for first in range(0, len(start_offsets), chunk_size):
+        last = first + chunk_size
+        chunk = list(islice(rows, chunk_size))
+        yield from fill_scheduled_fields(chunk, origin, start_offsets[first:last], end_offsets[first:last])
+
+
+def schedule_payload(
+    rows: List[Dict[str, Any]],
+    origin: datetime,
+    start_offsets: np.ndarray,
+    end_offsets: np.ndarray,
+    total_duration: int,
+    makespan: int,
+    efficiency_score: float,
+) -> Dict[str, Any]:
+    """Fill in the scheduled fields of `rows` and wrap them as a ScheduleResponse body."""
+    return {
+        "scheduled_tasks": fill_scheduled_fields(rows, origin, start_offsets, end_offsets),
+        "total_duration": total_duration,
+        "makespan": makespan,
+        "efficiency_score": efficiency_score,
+    }
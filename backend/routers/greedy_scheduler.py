@@ -1,15 +1,27 @@
-from fastapi import APIRouter, HTTPException
-from datetime import datetime, timedelta
-from typing import List
-from .models import Task, ScheduleRequest, ScheduledTask, ScheduleResponse
+from fastapi import APIRouter, Depends, HTTPException, Request
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Union
+from uuid import UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import get_session
+from services.task_service import TaskService
+from .models import Task, ScheduleRequest, ColumnarScheduleRequest, ScheduleResponse
+from .greedy_engine import PRIORITY_MAP, ENERGY_MAP, encode_levels, plan_schedule, schedule_payload, iter_scheduled_rows
+from .response_cache import conditional_json, task_versions
+from .responses import ORJSONResponse, ndjson_response, wants_ndjson
+from .schedule_cache import UserSchedule, client_schedules
+from .timing import mark_stage
+import numpy as np
 
 router = APIRouter()
 
+TASK_FIELDS = list(Task.model_fields)
+
 @router.post("/greedy", response_model=ScheduleResponse)
-async def greedy_schedule(request: ScheduleRequest):
+async def greedy_schedule(request: Union[ScheduleRequest, ColumnarScheduleRequest], http_request: Request):
     """
     Weighted Greedy scheduling algorithm that prioritizes tasks based on priority, time_estimate, and energy_level.
-    
+
     Sample payload:
     {
         "tasks": [
@@ -22,63 +34,166 @@ async def greedy_schedule(request: ScheduleRequest):
             }
         ]
     }
+
+    The same tasks can also be sent as parallel arrays:
+    {
+        "id": ["task1"],
+        "name": ["Complete Project"],
+        "priority": ["high"],
+        "time_estimate": [120],
+        "energy_level": ["high"]
+    }
+
+    With `Accept: application/x-ndjson` the scheduled tasks are streamed one
+    per line as they are placed, followed by a {"summary": {...}} line with
+    total_duration, makespan and efficiency_score.
     """
+    mark_stage("validation")
     try:
-        tasks = request.tasks
         current_time = datetime.now()
-        scheduled_tasks: List[ScheduledTask] = []
-        
-        # Assign numeric values
-        priority_map = {"high": 3, "medium": 2, "low": 1}
-        energy_map = {"high": 3, "medium": 2, "low": 1}
-        priority_weight = 3
-        energy_weight = 2
-        time_weight = 1
-
-        # Calculate score for each task
-        scored_tasks = []
-        for task in tasks:
-            score = (
-                priority_weight * priority_map.get(task.priority, 1)
-                + energy_weight * energy_map.get(task.energy_level, 1)
-                - time_weight * task.time_estimate
-            )
-            scored_tasks.append((task, score))
-
-        # Sort tasks by score descending
-        sorted_tasks = [t for t, _ in sorted(scored_tasks, key=lambda x: x[1], reverse=True)]
-        
-        for task in sorted_tasks:
-            scheduled_start = current_time
-            scheduled_end = scheduled_start + timedelta(minutes=task.time_estimate)
-            
-            scheduled_task = ScheduledTask(
-                **task.dict(),
-                scheduled_start=scheduled_start,
-                scheduled_end=scheduled_end,
-                completion_status="pending"
-            )
-            
-            scheduled_tasks.append(scheduled_task)
-            current_time = scheduled_end
-        
-        # Calculate metrics
-        total_duration = sum(task.time_estimate for task in scheduled_tasks)
-        makespan = (
-            (scheduled_tasks[-1].scheduled_end - scheduled_tasks[0].scheduled_start).total_seconds() / 60
-            if scheduled_tasks else 0
-        )
-        efficiency_score = (
-            sum(priority_map.get(task.priority, 1) for task in scheduled_tasks) / len(scheduled_tasks)
-            if scheduled_tasks else 0
+
+        if isinstance(request, ColumnarScheduleRequest):
+            priorities, energy_levels, time_estimates = request.priority, request.energy_level, request.time_estimate
+        else:
+            tasks = request.tasks
+            priorities = [task.priority for task in tasks]
+            energy_levels = [task.energy_level for task in tasks]
+            time_estimates = [task.time_estimate for task in tasks]
+
+        count = len(priorities)
+        plan = plan_schedule(
+            encode_levels(priorities, PRIORITY_MAP, count),
+            encode_levels(energy_levels, ENERGY_MAP, count),
+            np.fromiter(time_estimates, dtype=np.int64, count=count),
         )
-        
-        return ScheduleResponse(
-            scheduled_tasks=scheduled_tasks,
-            total_duration=total_duration,
-            makespan=makespan,
-            efficiency_score=efficiency_score
+        order = plan.order.tolist()
+
+        if isinstance(request, ColumnarScheduleRequest):
+            rows = _iter_column_rows(request, order)
+        else:
+            rows = (dict(tasks[i]) for i in order)
+
+        if wants_ndjson(http_request):
+            summary = {
+                "total_duration": plan.total_duration,
+                "makespan": plan.makespan,
+                "efficiency_score": plan.efficiency_score,
+            }
+            return ndjson_response(
+                iter_scheduled_rows(rows, current_time, plan.start_offsets, plan.end_offsets),
+                lambda: summary,
+            )
+
+        payload = schedule_payload(
+            list(rows), current_time, plan.start_offsets, plan.end_offsets,
+            plan.total_duration, plan.makespan, plan.efficiency_score,
         )
-        
+        mark_stage("construction")
+        response = ORJSONResponse(payload)
+        mark_stage("serialization")
+        return response
+
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e)) 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+def _iter_column_rows(request: ColumnarScheduleRequest, order: List[int]) -> Iterator[Dict[str, Any]]:
+    """Yield one plain dict per task, in scheduled order, from the request columns."""
+    columns = {field: getattr(request, field) for field in TASK_FIELDS}
+    defaults = {field: Task.model_fields[field].default for field in TASK_FIELDS}
+    for i in order:
+        yield {
+            field: defaults[field] if column is None else column[i]
+            for field, column in columns.items()
+        }
+
+# Stateful mode: the schedule is kept per user and patched one task at a time.
+# A task list PUT here is kept apart from the user's stored tasks, which
+# TaskService keeps scheduled; GET serves the PUT list while there is one.
+
+@router.put("/greedy/users/{user_id}", response_model=ScheduleResponse)
+async def load_user_schedule(user_id: str, request: ScheduleRequest):
+    """Replace the cached schedule for a user with a full task list; task ids must be unique."""
+    try:
+        schedule = client_schedules.load(user_id, request.tasks)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    task_versions.bump(user_id)
+    return ORJSONResponse(schedule.snapshot(datetime.now()))
+
+@router.get("/greedy/users/{user_id}", response_model=ScheduleResponse)
+async def get_user_schedule(user_id: str, http_request: Request, db: AsyncSession = Depends(get_session)):
+    """
+    Conditional GET: unchanged task sets are answered from cache or with a 304.
+
+    Serves the task list PUT for the user if there is one, otherwise the
+    greedy schedule of the user's stored tasks.
+    """
+    if client_schedules.get(user_id) is not None:
+        async def build():
+            return _cached_schedule(user_id).snapshot(datetime.now()), None
+
+        return await conditional_json(http_request, "greedy", user_id, build)
+
+    try:
+        stored_user_id = UUID(user_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="No cached schedule for user, PUT the task list first")
+
+    async def build_stored():
+        return await TaskService(db).get_greedy_schedule(stored_user_id), None
+
+    # Keyed like TaskService's version bumps, whatever the case of the id in the path,
+    # and apart from a PUT list's responses, which LRU eviction could otherwise leave current
+    return await conditional_json(http_request, "greedy-stored", stored_user_id, build_stored)
+
+@router.post("/greedy/users/{user_id}/tasks")
+async def add_user_task(user_id: str, task: Task):
+    schedule = _cached_schedule(user_id)
+    rank = schedule.add(task)
+    task_versions.bump(user_id)
+    return _mutation_result(schedule, task.id, rank)
+
+@router.put("/greedy/users/{user_id}/tasks/{task_id}")
+async def update_user_task(user_id: str, task_id: str, task: Task):
+    schedule = _cached_schedule(user_id)
+    if task_id not in schedule:
+        raise HTTPException(status_code=404, detail="Task not found")
+    task_versions.bump(user_id)
+    if task.id != task_id:
+        schedule.remove(task_id)
+        return _mutation_result(schedule, task.id, schedule.add(task))
+    return _mutation_result(schedule, task_id, schedule.update(task))
+
+@router.delete("/greedy/users/{user_id}/tasks/{task_id}")
+async def remove_user_task(user_id: str, task_id: str):
+    schedule = _cached_schedule(user_id)
+    if task_id not in schedule:
+        raise HTTPException(status_code=404, detail="Task not found")
+    schedule.remove(task_id)
+    task_versions.bump(user_id)
+    return _mutation_result(schedule, task_id, None)
+
+@router.post("/greedy/users/{user_id}/tasks/{task_id}/complete")
+async def complete_user_task(user_id: str, task_id: str):
+    schedule = _cached_schedule(user_id)
+    if task_id not in schedule:
+        raise HTTPException(status_code=404, detail="Task not found")
+    schedule.complete(task_id)
+    task_versions.bump(user_id)
+    return _mutation_result(schedule, task_id, None)
+
+def _cached_schedule(user_id: str) -> UserSchedule:
+    schedule = client_schedules.get(user_id)
+    if schedule is None:
+        raise HTTPException(status_code=404, detail="No cached schedule for user, PUT the task list first")
+    return schedule
+
+def _mutation_result(schedule: UserSchedule, task_id: str, rank: Optional[int]) -> Dict[str, Any]:
+    return {
+        "task_id": task_id,
+        "rank": rank,
+        "task_count": len(schedule),
+        "total_duration": schedule.total_duration,
+        "makespan": schedule.makespan,
+        "efficiency_score": schedule.efficiency_score,
+    }
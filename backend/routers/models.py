@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Literal, Optional, Union
 from datetime import datetime
 
 class Task(BaseModel):
@@ -17,6 +17,27 @@ class Task(BaseModel):
 class ScheduleRequest(BaseModel):
     tasks: List[Task]
 
+class ColumnarScheduleRequest(BaseModel):
+    """Parallel-array form of ScheduleRequest: index i of every column is one task."""
+    id: List[str]
+    name: List[str]
+    priority: List[str]
+    time_estimate: List[int]
+    energy_level: List[str]
+    description: Optional[List[Optional[str]]] = None
+    due_date: Optional[List[Optional[datetime]]] = None
+    completed: Optional[List[Optional[bool]]] = None
+    start_time: Optional[List[Optional[datetime]]] = None
+    end_time: Optional[List[Optional[datetime]]] = None
+
+    @model_validator(mode="after")
+    def check_column_lengths(self):
+        size = len(self.id)
+        for field, column in self:
+            if column is not None and len(column) != size:
+                raise ValueError(f"column '{field}' has {len(column)} values, expected {size}")
+        return self
+
 class ScheduledTask(Task):
     scheduled_start: datetime
     scheduled_end: datetime
@@ -26,4 +47,61 @@ class ScheduleResponse(BaseModel):
     scheduled_tasks: List[ScheduledTask]
     total_duration: int
     makespan: int
-    efficiency_score: float 
\ No newline at end of file
+    efficiency_score: float
+
+class Dependency(BaseModel):
+    task_id: str  # the dependent task
+    dependency_id: str  # must finish before task_id can start
+
+class TopologicalSortRequest(BaseModel):
+    tasks: List[Task]
+    dependencies: List[Dependency] = []
+    user_id: Optional[str] = None  # keep the graph cached for incremental edits
+
+class TopologicalScheduledTask(ScheduledTask):
+    slack: int  # minutes the task can slip without delaying the makespan
+    critical: bool
+
+class TopologicalSortResponse(BaseModel):
+    order: List[str]
+    scheduled_tasks: List[TopologicalScheduledTask]
+    makespan: int
+    critical_path: List[str]
+
+class DynamicProgrammingRequest(BaseModel):
+    tasks: List[Task]
+    # Time available today; the knapsack table grows with it, so at most one day
+    budget_minutes: int = Field(480, ge=0, le=1440)
+    algorithm: Literal["knapsack", "interval"] = "knapsack"
+
+class DynamicProgrammingResponse(BaseModel):
+    algorithm: str
+    scheduled_tasks: List[ScheduledTask]
+    total_value: int
+    used_minutes: int
+    budget_minutes: int
+
+class EnergyWindow(BaseModel):
+    start: datetime
+    end: datetime
+    energy_level: str = "high"  # highest task energy level the resource can take in this window
+
+class Resource(BaseModel):
+    id: str
+    energy_windows: Optional[List[EnergyWindow]] = None  # None means always available at any energy
+
+class ParallelScheduleRequest(BaseModel):
+    tasks: List[Task]
+    dependencies: List[Dependency] = []
+    resources: Union[int, List[Resource]] = 1  # a count of always-available resources, or each one
+
+class ParallelScheduledTask(ScheduledTask):
+    resource_id: str
+    late: bool  # finishes after due_date
+
+class ParallelScheduleResponse(BaseModel):
+    scheduled_tasks: List[ParallelScheduledTask]
+    unscheduled_tasks: List[str]  # ids with no energy window long enough on any resource
+    total_duration: int
+    makespan: int
+    utilization: float  # busy minutes / (resources * makespan)
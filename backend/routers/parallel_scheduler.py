@@ -0,0 +1,284 @@
+"""
+Multi-resource list scheduling for /api/parallel-schedule.
+
+Instead of one serial timeline, tasks are spread over several resources
+(people, or focus and background tracks). A task is ready once all of its
+dependencies are placed; ready tasks are taken earliest due_date first, and
+longest first among equal due dates (LPT), with the greedy score breaking
+the remaining ties. Each goes to the resource where it can start soonest,
+never before its dependencies finish.
+
+Resources sit in a min-heap keyed by the minute they become free, so with
+always-available resources a placement costs O(log m) and the schedule
+O(n log n + e + n log m) for n tasks, e dependencies and m resources. A
+resource can also be limited to energy windows: a task only runs inside one
+window whose energy level is at least the task's, and placing it may have
+to look at more than one resource.
+"""
+import heapq
+from bisect import bisect_right
+from datetime import datetime, timezone
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from .greedy_engine import ENERGY_MAP, PRIORITY_MAP, compute_scores, encode_levels, fill_scheduled_fields, greedy_order
+from .models import ParallelScheduleRequest, ParallelScheduleResponse, Resource
+from .priority_queue import minutes_until
+from .responses import ORJSONResponse
+from .topological_sort import CycleError, build_csr, find_cycle
+
+router = APIRouter()
+
+NO_DEADLINE = np.iinfo(np.int64).max
+
+# Sorted, non-overlapping (starts, ends, energy levels) in minutes from the origin;
+# None for a resource that is always available at any energy
+Windows = Optional[Tuple[List[int], List[int], List[int]]]
+
+
+class ParallelPlan(NamedTuple):
+    order: np.ndarray  # placed task indices, by start time
+    resource: np.ndarray  # resource index of each placed task
+    start_offsets: np.ndarray  # minutes from the origin
+    end_offsets: np.ndarray
+    unscheduled: List[int]  # task indices that fit no window, or depend on one that didn't
+    makespan: int
+    utilization: float
+
+
+def fit_in_windows(windows: Windows, earliest: int, duration: int, energy: int) -> Optional[int]:
+    """Soonest start at or after `earliest` inside one window that allows `energy`."""
+    if windows is None:
+        return earliest
+    starts, ends, levels = windows
+    for i in range(bisect_right(ends, earliest), len(ends)):
+        start = max(earliest, starts[i])
+        if levels[i] >= energy and start + duration <= ends[i]:
+            return start
+    return None
+
+
+def _place(free: list, windows: Sequence[Windows], earliest: int, duration: int, energy: int) -> Optional[Tuple[int, int]]:
+    """
+    Pop resources in order of availability until none left can start the task
+    sooner than the best found, book the best one and return (start, resource).
+    """
+    best: Optional[Tuple[int, int]] = None
+    popped = []
+    while free:
+        available, resource = free[0]
+        if best is not None and max(available, earliest) >= best[0]:
+            break
+        heapq.heappop(free)
+        popped.append((available, resource))
+        start = fit_in_windows(windows[resource], max(available, earliest), duration, energy)
+        if start is not None and (best is None or start < best[0]):
+            best = (start, resource)
+
+    for available, resource in popped:
+        if best is None or resource != best[1]:
+            heapq.heappush(free, (available, resource))
+    if best is not None:
+        heapq.heappush(free, (best[0] + duration, best[1]))
+    return best
+
+
+def list_schedule(
+    ids: Sequence[str],
+    durations: np.ndarray,
+    deadlines: np.ndarray,
+    energy: np.ndarray,
+    rank: np.ndarray,
+    src: np.ndarray,
+    dst: np.ndarray,
+    windows: Sequence[Windows],
+) -> ParallelPlan:
+    """
+    Place every task on one of `len(windows)` resources. `src[k]` must finish
+    before `dst[k]` starts; `ids` only name the tasks of a dependency cycle
+    in the CycleError raised for one.
+    """
+    n = len(durations)
+    indptr, targets = build_csr(n, src, dst)
+    indptr, targets = indptr.tolist(), targets.tolist()
+    indegree = np.bincount(dst, minlength=n).tolist()
+    duration_list = durations.tolist()
+    energy_list = energy.tolist()
+    # One int per task for the ready heap: due date, then longest first, then greedy rank
+    by_priority = np.lexsort((rank, -durations, deadlines))
+    key = np.empty(n, dtype=np.int64)
+    key[by_priority] = np.arange(n)
+    by_priority, key = by_priority.tolist(), key.tolist()
+
+    ready_at = [0] * n
+    blocked = [False] * n
+    ready = [key[i] for i in range(n) if not indegree[i]]
+    heapq.heapify(ready)
+    free = [(0, resource) for resource in range(len(windows))]
+    always_available = all(calendar is None for calendar in windows)
+    pop, push, replace = heapq.heappop, heapq.heappush, heapq.heapreplace
+
+    placed, resources, starts, unscheduled = [], [], [], []
+    processed = 0
+    while ready:
+        task = by_priority[pop(ready)]
+        processed += 1
+        duration = duration_list[task]
+        if blocked[task]:
+            booking = None
+        elif always_available:
+            available, resource = free[0]
+            booking = (max(available, ready_at[task]), resource)
+            replace(free, (booking[0] + duration, resource))
+        else:
+            booking = _place(free, windows, ready_at[task], duration, energy_list[task])
+        if booking is None:
+            unscheduled.append(task)
+            finish = None
+        else:
+            start, resource = booking
+            placed.append(task)
+            resources.append(resource)
+            starts.append(start)
+            finish = start + duration
+
+        for successor in targets[indptr[task]:indptr[task + 1]]:
+            if finish is None:
+                blocked[successor] = True
+            elif ready_at[successor] < finish:
+                ready_at[successor] = finish
+            indegree[successor] -= 1
+            if not indegree[successor]:
+                push(ready, key[successor])
+
+    if processed < n:
+        rev_indptr, sources = build_csr(n, dst, src)
+        raise CycleError([ids[node] for node in find_cycle(rev_indptr, sources, np.asarray(indegree) > 0)])
+
+    placed = np.asarray(placed, dtype=np.int64)
+    resources = np.asarray(resources, dtype=np.int64)
+    start_offsets = np.asarray(starts, dtype=np.int64)
+    end_offsets = start_offsets + durations[placed]
+    by_start = np.lexsort((resources, start_offsets))
+
+    makespan = int(end_offsets.max()) if placed.size else 0
+    busy = int(durations[placed].sum())
+    return ParallelPlan(
+        order=placed[by_start],
+        resource=resources[by_start],
+        start_offsets=start_offsets[by_start],
+        end_offsets=end_offsets[by_start],
+        unscheduled=unscheduled,
+        makespan=makespan,
+        utilization=busy / (len(windows) * makespan) if makespan else 0.0,
+    )
+
+
+def resource_windows(resources: Sequence[Resource], origin: datetime) -> List[Windows]:
+    """Minute offsets of each resource's energy windows; raises ValueError for inverted or overlapping ones."""
+    origin_utc = origin.astimezone(timezone.utc)
+    calendars = []
+    for resource in resources:
+        if resource.energy_windows is None:
+            calendars.append(None)
+            continue
+        windows = sorted(
+            (
+                # Rounded inwards so a task never starts before or ends after its window
+                minutes_until(window.start, origin, origin_utc, 0, ceil=True),
+                minutes_until(window.end, origin, origin_utc, 0),
+                ENERGY_MAP.get(window.energy_level, 1),
+            )
+            for window in resource.energy_windows
+        )
+        if any(end < start for start, end, _ in windows):
+            raise ValueError(f"An energy window of resource '{resource.id}' ends before it starts")
+        for (_, previous_end, _), (start, _, _) in zip(windows, windows[1:]):
+            if start < previous_end:
+                raise ValueError(f"Energy windows of resource '{resource.id}' overlap")
+        calendars.append((
+            [start for start, _, _ in windows],
+            [end for _, end, _ in windows],
+            [level for _, _, level in windows],
+        ))
+    return calendars
+
+
+@router.post("/parallel-schedule", response_model=ParallelScheduleResponse)
+@router.post("/dijkstra-schedule", response_model=ParallelScheduleResponse, include_in_schema=False)
+async def parallel_schedule(request: ParallelScheduleRequest):
+    """
+    Spread tasks over parallel resources, respecting dependencies.
+
+    Sample payload:
+    {
+        "tasks": [...same as /greedy...],
+        "dependencies": [{"task_id": "task2", "dependency_id": "task1"}],
+        "resources": [
+            {"id": "focus", "energy_windows": [
+                {"start": "2025-01-06T09:00:00", "end": "2025-01-06T12:00:00", "energy_level": "high"}
+            ]},
+            {"id": "background"}
+        ]
+    }
+    `resources` may also be a count of always-available resources, named "0", "1", ...
+    """
+    if isinstance(request.resources, int):
+        if request.resources < 1:
+            raise HTTPException(status_code=422, detail="resources must be at least 1")
+        resources = [Resource(id=str(i)) for i in range(request.resources)]
+    elif not request.resources:
+        raise HTTPException(status_code=422, detail="resources must not be empty")
+    else:
+        resources = request.resources
+
+    tasks = request.tasks
+    n = len(tasks)
+    current_time = datetime.now()
+    try:
+        windows = resource_windows(resources, current_time)
+        index = {task.id: i for i, task in enumerate(tasks)}
+        src = np.fromiter((index[dep.dependency_id] for dep in request.dependencies), dtype=np.int64, count=len(request.dependencies))
+        dst = np.fromiter((index[dep.task_id] for dep in request.dependencies), dtype=np.int64, count=len(request.dependencies))
+    except KeyError as e:
+        raise HTTPException(status_code=422, detail=f"Unknown task id '{e.args[0]}'")
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    origin_utc = current_time.astimezone(timezone.utc)
+    durations = np.fromiter((task.time_estimate for task in tasks), dtype=np.int64, count=n)
+    deadlines = np.fromiter(
+        (minutes_until(task.due_date, current_time, origin_utc, NO_DEADLINE) for task in tasks),
+        dtype=np.int64,
+        count=n,
+    )
+    energy = encode_levels((task.energy_level for task in tasks), ENERGY_MAP, n)
+    priority = encode_levels((task.priority for task in tasks), PRIORITY_MAP, n)
+    rank = np.empty(n, dtype=np.int64)
+    rank[greedy_order(compute_scores(priority, energy, durations))] = np.arange(n)
+
+    try:
+        plan = list_schedule([task.id for task in tasks], durations, deadlines, energy, rank, src, dst, windows)
+    except CycleError as e:
+        raise HTTPException(status_code=422, detail={"message": "Dependency cycle detected", "cycle": e.cycle})
+
+    try:
+        rows = fill_scheduled_fields(
+            [dict(tasks[i]) for i in plan.order.tolist()], current_time, plan.start_offsets, plan.end_offsets,
+        )
+        late = plan.end_offsets > deadlines[plan.order]
+        for row, resource, is_late in zip(rows, plan.resource.tolist(), late.tolist()):
+            row["resource_id"] = resources[resource].id
+            row["late"] = is_late
+        return ORJSONResponse({
+            "scheduled_tasks": rows,
+            "unscheduled_tasks": [tasks[i].id for i in plan.unscheduled],
+            "total_duration": int(durations[plan.order].sum()),
+            "makespan": plan.makespan,
+            "utilization": plan.utilization,
+        })
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
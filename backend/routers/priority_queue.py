@@ -0,0 +1,247 @@
+"""
+Deadline-driven schedulers used by TaskService.get_schedule and /api/priority-queue.
+
+Tasks use the TaskService shape: id, name, importance, duration (minutes),
+deadline (datetime or None) and dependencies. Both algorithms read from one
+PreparedTasks instance, so the task list is only converted to arrays once.
+"""
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from .greedy_engine import PRIORITY_MAP
+from .models import ScheduleRequest
+from .responses import ORJSONResponse
+
+router = APIRouter()
+
+# Length of one schedulable slot for deadline job scheduling
+SLOT_MINUTES = 15
+
+
+class PreparedTasks(NamedTuple):
+    tasks: Sequence[Dict[str, Any]]
+    origin: datetime  # naive local time the offsets are measured from
+    importance: np.ndarray
+    duration: np.ndarray  # minutes
+    deadline: np.ndarray  # minutes from origin; tasks without a deadline get the horizon
+    slots: np.ndarray  # SLOT_MINUTES slots needed per task
+    deadline_slot: np.ndarray  # last slot (1-based) a task may occupy
+    horizon: int  # total slots needed by all tasks
+
+
+def prepare_tasks(tasks: Sequence[Dict[str, Any]], origin: Optional[datetime] = None) -> PreparedTasks:
+    """Convert task dicts into the arrays shared by both schedulers."""
+    origin = origin or datetime.now()
+    origin_utc = origin.astimezone(timezone.utc)
+    count = len(tasks)
+
+    importance = np.fromiter((task["importance"] for task in tasks), dtype=np.int64, count=count)
+    duration = np.fromiter((max(task["duration"], 0) for task in tasks), dtype=np.int64, count=count)
+    slots = np.maximum(-(-duration // SLOT_MINUTES), 1)
+    horizon = int(slots.sum())
+
+    no_deadline = np.iinfo(np.int64).max
+    deadline = np.fromiter(
+        (minutes_until(task["deadline"], origin, origin_utc, no_deadline) for task in tasks),
+        dtype=np.int64,
+        count=count,
+    )
+    has_deadline = deadline != no_deadline
+    deadline[~has_deadline] = horizon * SLOT_MINUTES
+    # A slot is usable when it ends by the deadline; nothing needs slots past the horizon
+    deadline_slot = np.minimum(np.floor_divide(deadline, SLOT_MINUTES), horizon)
+
+    return PreparedTasks(tasks, origin, importance, duration, deadline, slots, deadline_slot, horizon)
+
+
+def minutes_until(
+    deadline: Optional[datetime], origin: datetime, origin_utc: datetime, missing: int, ceil: bool = False
+) -> int:
+    """Whole minutes from origin to deadline, rounded down unless `ceil`."""
+    if deadline is None:
+        return missing
+    if deadline.tzinfo is None:
+        delta = deadline - origin
+    else:
+        delta = deadline - origin_utc
+    seconds = delta.total_seconds()
+    return int(-(-seconds // 60)) if ceil else int(seconds // 60)
+
+
+def _as_prepared(tasks: Union[Sequence[Dict[str, Any]], PreparedTasks]) -> PreparedTasks:
+    return tasks if isinstance(tasks, PreparedTasks) else prepare_tasks(tasks)
+
+
+def greedy_job_scheduling(tasks: Union[Sequence[Dict[str, Any]], PreparedTasks]) -> List[Dict[str, Any]]:
+    """
+    Deadline job scheduling: take tasks by importance (max-heap, earlier deadline
+    first on ties) and give each one the latest run of consecutive free slots
+    that ends by its deadline, so no two reported windows overlap.
+
+    Free slots are kept as maximal runs in a max segment tree indexed by the
+    run's last slot and holding its length. For each task one descent finds
+    the run straddling its deadline slot, and another the latest run that
+    ends before it and is long enough; claiming the run's tail splits it with
+    two point updates. O(n log n + n log S) for S = total slots.
+    """
+    prepared = _as_prepared(tasks)
+    horizon = prepared.horizon
+    size = 1
+    while size <= horizon:
+        size *= 2
+    # Leaf `size + end` holds the length of the free run ending at slot `end` (slots are 1-based)
+    tree = [0] * (2 * size)
+
+    def set_run(end: int, length: int) -> None:
+        node = size + end
+        tree[node] = length
+        node >>= 1
+        while node:
+            left, right = tree[2 * node], tree[2 * node + 1]
+            best = left if left > right else right
+            if tree[node] == best:
+                break
+            tree[node] = best
+            node >>= 1
+
+    def latest_run(end: int, needed: int) -> int:
+        """Last slot of the latest run ending at or before `end` with at least `needed` slots, or 0."""
+        node = size + end
+        while tree[node] < needed:
+            # Step to the subtree just left of this one; none is left once only left edges lead up to the root
+            while not node & 1:
+                node >>= 1
+            if node == 1:
+                return 0
+            node -= 1
+        while node < size:
+            node = 2 * node + 1 if tree[2 * node + 1] >= needed else 2 * node
+        return node - size
+
+    def next_run(start: int) -> int:
+        """Last slot of the earliest run ending at or after `start`, or 0."""
+        if start > horizon:
+            return 0
+        node = size + start
+        while not tree[node]:
+            while node & 1:
+                node >>= 1
+            if node == 0:
+                return 0
+            node += 1
+        while node < size:
+            node = 2 * node if tree[2 * node] else 2 * node + 1
+        return node - size
+
+    if horizon:
+        set_run(horizon, horizon)
+
+    heap = list(zip((-prepared.importance).tolist(), prepared.deadline.tolist(), range(len(prepared.tasks))))
+    heapq.heapify(heap)
+    slots = prepared.slots.tolist()
+    deadline_slot = prepared.deadline_slot.tolist()
+
+    windows: Dict[int, tuple] = {}
+    while heap:
+        _, _, index = heapq.heappop(heap)
+        last = deadline_slot[index]
+        needed = slots[index]
+        if last <= 0:
+            continue
+        # A run that goes on past the deadline can still end the task exactly at it
+        run_end = next_run(last)
+        run_start = run_end - tree[size + run_end] + 1
+        if run_end and run_start <= last and last - run_start + 1 >= needed:
+            claim_end = last
+        else:
+            run_end = claim_end = latest_run(last, needed)
+            if not run_end:
+                continue
+            run_start = run_end - tree[size + run_end] + 1
+        claim_start = claim_end - needed + 1
+        set_run(run_end, run_end - claim_end)
+        if claim_start > run_start:
+            set_run(claim_start - 1, claim_start - run_start)
+        windows[index] = (claim_start, claim_end)
+
+    ordered = sorted(windows, key=lambda index: windows[index][0])
+    return [
+        _scheduled(prepared, index, (windows[index][0] - 1) * SLOT_MINUTES, windows[index][1] * SLOT_MINUTES)
+        for index in ordered
+    ]
+
+
+def activity_selection(tasks: Union[Sequence[Dict[str, Any]], PreparedTasks]) -> List[Dict[str, Any]]:
+    """
+    Activity selection over each task's latest window [deadline - duration, deadline]:
+    sort by end time and keep every task that starts after the previous pick ends.
+    O(n log n).
+    """
+    prepared = _as_prepared(tasks)
+    ends = prepared.deadline
+    starts = ends - prepared.duration
+    order = np.lexsort((starts, ends))
+    # Windows that start in the past cannot be used
+    order = order[starts[order] >= 0]
+
+    selected = []
+    last_end = 0
+    starts_list = starts.tolist()
+    ends_list = ends.tolist()
+    for index in order.tolist():
+        if starts_list[index] >= last_end:
+            selected.append(_scheduled(prepared, index, starts_list[index], ends_list[index]))
+            last_end = ends_list[index]
+    return selected
+
+
+def best_schedule(tasks: Union[Sequence[Dict[str, Any]], PreparedTasks]) -> Dict[str, Any]:
+    """Run both algorithms on the same prepared arrays and keep the one that fits more tasks."""
+    prepared = _as_prepared(tasks)
+    greedy_schedule = greedy_job_scheduling(prepared)
+    activity_schedule = activity_selection(prepared)
+
+    # Choose the better schedule
+    use_greedy = len(greedy_schedule) >= len(activity_schedule)
+    final_schedule = greedy_schedule if use_greedy else activity_schedule
+    return {
+        "scheduled_tasks": final_schedule,
+        "algorithm_used": "greedy" if use_greedy else "activity_selection",
+        "total_tasks_scheduled": len(final_schedule),
+    }
+
+
+def _scheduled(prepared: PreparedTasks, index: int, start: int, end: int) -> Dict[str, Any]:
+    task = dict(prepared.tasks[index])
+    task["scheduled_start"] = prepared.origin + timedelta(minutes=int(start))
+    task["scheduled_end"] = prepared.origin + timedelta(minutes=int(end))
+    return task
+
+
+@router.post("/priority-queue")
+async def priority_queue_schedule(request: ScheduleRequest):
+    """
+    Deadline job scheduling / activity selection over the request tasks.
+    Uses the same payload as /greedy; `due_date` is the deadline and
+    `priority` the importance.
+    """
+    try:
+        tasks = [
+            {
+                "id": task.id,
+                "name": task.name,
+                "importance": PRIORITY_MAP.get(task.priority, 1),
+                "duration": task.time_estimate,
+                "deadline": task.due_date,
+                "dependencies": [],
+            }
+            for task in request.tasks
+        ]
+        return ORJSONResponse(best_schedule(tasks))
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
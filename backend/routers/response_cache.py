@@ -0,0 +1,104 @@
+"""
+Conditional-GET caching for the endpoints the dashboard polls.
+
+Every user has a task-set version that TaskService (and the stateful
+router endpoints) bump on each mutation. Rendered JSON bodies are cached
+under (endpoint, user, version) with a strong ETag, so a poll that sends
+a matching If-None-Match is answered with 304 before any task is loaded
+or analysed, and a changed task set simply misses the old key.
+"""
+import hashlib
+from typing import Any, Awaitable, Callable, Hashable, NamedTuple, Optional, Tuple
+
+import orjson
+from fastapi import APIRouter, Request, Response
+
+from .cache import LRUCache
+from .responses import ORJSON_OPTIONS
+
+router = APIRouter()
+
+MAX_CACHED_RESPONSES = 4096
+MAX_TRACKED_USERS = 65536
+RESPONSE_TTL_SECONDS = 60.0
+
+
+class TaskVersions:
+    """
+    Per-user task-set versions, drawn from one counter that only grows.
+
+    Only the `maxsize` most recently used users are kept. A user without an
+    entry (never changed, or evicted) is given the counter's current value:
+    any change to the user has since moved the counter past every version its
+    cached responses were stored under, so none of those can match.
+    """
+
+    def __init__(self, maxsize: int = MAX_TRACKED_USERS):
+        self._versions: LRUCache[int] = LRUCache(maxsize)
+        self._counter = 0
+
+    def get(self, user_id: Any) -> int:
+        key = str(user_id)
+        version = self._versions.get(key)
+        if version is None:
+            version = self._counter
+            self._versions.put(key, version)
+        return version
+
+    def bump(self, user_id: Any) -> int:
+        self._counter += 1
+        self._versions.put(str(user_id), self._counter)
+        return self._counter
+
+
+class CachedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+task_versions = TaskVersions()
+response_cache: LRUCache[CachedResponse] = LRUCache(MAX_CACHED_RESPONSES, ttl=RESPONSE_TTL_SECONDS)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+async def conditional_json(
+    request: Request,
+    endpoint: str,
+    user_id: Any,
+    build: Callable[[], Awaitable[Tuple[Any, Optional[float]]]],
+) -> Response:
+    """
+    Serve a cached JSON body for the user's current task-set version, or
+    build, cache and serve a new one. `build` returns the payload and an
+    optional lifetime in seconds for content that goes stale with time.
+    """
+    key: Hashable = (endpoint, str(user_id), task_versions.get(user_id))
+    cached = response_cache.get(key)
+    if cached is None:
+        payload, max_age = await build()
+        body = orjson.dumps(payload, option=ORJSON_OPTIONS)
+        cached = CachedResponse(body, make_etag(body))
+        response_cache.put(key, cached, ttl=max_age)
+
+    headers = {"ETag": cached.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    return response_cache.stats()
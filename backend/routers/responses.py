@@ -0,0 +1,55 @@
+"""
+Response helpers shared by the scheduling routers.
+
+Endpoints build plain dicts and return them through ORJSONResponse, which
+skips FastAPI's second validation pass against `response_model`. Clients
+that send `Accept: application/x-ndjson` can get one JSON object per line
+instead, produced from a generator so the body is never held in memory.
+"""
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+from fastapi.responses import StreamingResponse
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# UTC as "Z" matches how pydantic serializes datetimes
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_SERIALIZE_NUMPY
+
+# Rows are encoded in batches so each chunk written to the socket is a useful size
+STREAM_BATCH_SIZE = 512
+
+
+class ORJSONResponse(_ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+Summary = Optional[Callable[[], Dict[str, Any]]]
+
+
+def iter_ndjson(rows: Iterable[Dict[str, Any]], summary: Summary = None) -> Iterator[bytes]:
+    """
+    Encode rows as NDJSON lines, then a trailing {"summary": ...} record if given.
+    `summary` is called after the last row, so it can report totals gathered while streaming.
+    """
+    batch = []
+    for row in rows:
+        batch.append(orjson.dumps(row, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE))
+        if len(batch) >= STREAM_BATCH_SIZE:
+            yield b"".join(batch)
+            batch = []
+    if summary is not None:
+        batch.append(orjson.dumps({"summary": summary()}, option=ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE))
+    if batch:
+        yield b"".join(batch)
+
+
+def ndjson_response(rows: Iterable[Dict[str, Any]], summary: Summary = None) -> StreamingResponse:
+    return StreamingResponse(iter_ndjson(rows, summary), media_type=NDJSON_MEDIA_TYPE)
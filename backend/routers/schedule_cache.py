@@ -0,0 +1,192 @@
+"""
+Per-user incremental greedy schedules.
+
+Each cached user keeps the greedy ordering in a SortedList keyed by
+(-score, insertion sequence, task id), which reproduces the stable
+descending sort of /api/greedy. Single-task edits cost O(log n) on the
+ordering; start/end offsets are only recomputed from the first rank an
+edit touched, and only when the schedule is next read.
+"""
+from datetime import datetime
+from itertools import count, islice
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sortedcontainers import SortedList
+
+from .cache import LRUCache
+from .greedy_engine import PRIORITY_MAP, score_task, schedule_payload
+from .models import Task
+
+MAX_CACHED_USERS = 1024
+
+SortKey = Tuple[int, int, str]
+
+
+class UserSchedule:
+    """Greedy ordering of one user's tasks, maintained under single-task edits."""
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self._tasks: Dict[str, Task] = {}
+        self._keys: Dict[str, SortKey] = {}
+        self._seq = count()
+        keys = []
+        for task in tasks:
+            # Tasks are addressed by id, so a second task with the same id could never be edited or removed
+            if task.id in self._tasks:
+                raise ValueError(f"Duplicate task id '{task.id}'")
+            keys.append(self._register(task))
+        self._order = SortedList(keys)
+        # _ends[rank] is the cumulative end offset (minutes) of the task at
+        # that rank; entries from _dirty_from onwards are stale.
+        self._ends: List[int] = []
+        self._dirty_from = 0
+        self.total_duration = sum(task.time_estimate for task in self._tasks.values())
+        self._priority_sum = sum(PRIORITY_MAP.get(task.priority, 1) for task in self._tasks.values())
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._tasks
+
+    @property
+    def makespan(self) -> int:
+        # Tasks run back to back, so the timeline is exactly as long as the work
+        return self.total_duration
+
+    @property
+    def efficiency_score(self) -> float:
+        return self._priority_sum / len(self._order) if self._order else 0.0
+
+    def add(self, task: Task) -> int:
+        """Insert a new task (or replace an existing one) and return its rank."""
+        if task.id in self._tasks:
+            return self.update(task)
+        key = self._register(task)
+        self._order.add(key)
+        rank = self._order.index(key)
+        self._account(task, 1)
+        self._invalidate(rank)
+        return rank
+
+    def update(self, task: Task) -> int:
+        """Rescore an existing task, keeping its original tie-break position."""
+        old_key = self._keys.get(task.id)
+        if old_key is None:
+            raise KeyError(task.id)
+        old_rank = self._order.index(old_key)
+        self._order.remove(old_key)
+        self._account(self._tasks[task.id], -1)
+
+        key = (-score_task(task.priority, task.energy_level, task.time_estimate), old_key[1], task.id)
+        self._keys[task.id] = key
+        self._tasks[task.id] = task
+        self._order.add(key)
+        rank = self._order.index(key)
+        self._account(task, 1)
+        self._invalidate(min(old_rank, rank))
+        return rank
+
+    def remove(self, task_id: str) -> Task:
+        key = self._keys.pop(task_id)
+        rank = self._order.index(key)
+        self._order.remove(key)
+        task = self._tasks.pop(task_id)
+        self._account(task, -1)
+        self._invalidate(rank)
+        return task
+
+    def complete(self, task_id: str) -> Task:
+        """Mark a task completed and drop it from the remaining timeline."""
+        task = self.remove(task_id)
+        return task.model_copy(update={"completed": True})
+
+    def snapshot(self, origin: datetime) -> Dict[str, Any]:
+        """Build a ScheduleResponse body anchored at `origin`."""
+        self._refresh()
+        ends = np.fromiter(self._ends, dtype=np.int64, count=len(self._ends))
+        durations = np.fromiter(
+            (self._tasks[key[2]].time_estimate for key in self._order),
+            dtype=np.int64,
+            count=len(self._order),
+        )
+        rows = [dict(self._tasks[key[2]]) for key in self._order]
+        return schedule_payload(
+            rows, origin, ends - durations, ends,
+            self.total_duration, self.makespan, self.efficiency_score,
+        )
+
+    def _register(self, task: Task) -> SortKey:
+        key = (-score_task(task.priority, task.energy_level, task.time_estimate), next(self._seq), task.id)
+        self._tasks[task.id] = task
+        self._keys[task.id] = key
+        return key
+
+    def _account(self, task: Task, sign: int) -> None:
+        self.total_duration += sign * task.time_estimate
+        self._priority_sum += sign * PRIORITY_MAP.get(task.priority, 1)
+
+    def _invalidate(self, rank: int) -> None:
+        self._dirty_from = min(self._dirty_from, rank)
+
+    def _refresh(self) -> None:
+        """Recompute end offsets for the stale suffix of the ordering."""
+        start = min(self._dirty_from, len(self._ends))
+        del self._ends[start:]
+        current = self._ends[-1] if self._ends else 0
+        for key in islice(self._order, start, None):
+            current += self._tasks[key[2]].time_estimate
+            self._ends.append(current)
+        self._dirty_from = len(self._ends)
+
+
+class ScheduleCache:
+    """LRU-bounded map of user id -> UserSchedule.
+
+    The task-level methods are no-ops for users that are not cached; their
+    schedule is rebuilt from the full task list on the next load.
+    """
+
+    def __init__(self, maxsize: int = MAX_CACHED_USERS):
+        self._schedules: LRUCache[UserSchedule] = LRUCache(maxsize)
+
+    def load(self, user_id: str, tasks: Iterable[Task]) -> UserSchedule:
+        schedule = UserSchedule(tasks)
+        self._schedules.put(str(user_id), schedule)
+        return schedule
+
+    def get(self, user_id: str) -> Optional[UserSchedule]:
+        return self._schedules.get(str(user_id))
+
+    def evict(self, user_id: str) -> None:
+        self._schedules.pop(str(user_id))
+
+    def add_task(self, user_id: str, task: Task) -> Optional[int]:
+        schedule = self._schedules.get(str(user_id))
+        return schedule.add(task) if schedule is not None else None
+
+    def update_task(self, user_id: str, task: Task) -> Optional[int]:
+        schedule = self._schedules.get(str(user_id))
+        if schedule is None:
+            return None
+        return schedule.update(task) if task.id in schedule else schedule.add(task)
+
+    def remove_task(self, user_id: str, task_id: str) -> None:
+        schedule = self._schedules.get(str(user_id))
+        if schedule is not None and task_id in schedule:
+            schedule.remove(task_id)
+
+    def complete_task(self, user_id: str, task_id: str) -> None:
+        schedule = self._schedules.get(str(user_id))
+        if schedule is not None and task_id in schedule:
+            schedule.complete(task_id)
+
+    def __len__(self) -> int:
+        return len(self._schedules)
+
+
+# Schedules of stored tasks: loaded by TaskService and patched by every change it commits
+schedule_cache = ScheduleCache()
+# Task lists PUT to /api/greedy/users/{user_id}; only those routes edit them
+client_schedules = ScheduleCache()
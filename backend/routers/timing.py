@@ -0,0 +1,169 @@
+"""
+Per-stage request timing, reported as a Server-Timing header.
+
+Handlers call `mark_stage(name)` at the end of each stage; the stage's
+duration is the time since the previous mark (or since the request
+arrived, so the first mark also covers body parsing and validation).
+ServerTimingMiddleware collects the marks of one request and adds
+
+    Server-Timing: validation;dur=1.204, scoring;dur=0.311, ..., total;dur=3.020
+
+to the response. With histograms enabled every stage is also recorded per
+route and served in the Prometheus text format at /api/metrics.
+
+Configured from the environment:
+
+    SERVER_TIMING          1 to install the middleware
+    SERVER_TIMING_METRICS  1 to also keep histograms and serve /api/metrics
+
+When the middleware is not installed `mark_stage` only reads a context
+variable and returns.
+"""
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+router = APIRouter()
+
+# Upper bounds in seconds, as used by Prometheus client libraries
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+SERVER_TIMING = _flag("SERVER_TIMING")
+SERVER_TIMING_METRICS = _flag("SERVER_TIMING_METRICS")
+
+
+class StageTimer:
+    """Durations of the stages of one request, in the order they were marked."""
+
+    __slots__ = ("started", "last", "stages")
+
+    def __init__(self):
+        self.started = self.last = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+
+    def mark(self, name: str) -> None:
+        now = time.perf_counter()
+        self.stages.append((name, now - self.last))
+        self.last = now
+
+    def totals(self) -> Dict[str, float]:
+        """Seconds per stage name, summing stages marked more than once."""
+        totals: Dict[str, float] = {}
+        for name, seconds in self.stages:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def header(self) -> str:
+        parts = [f"{name};dur={seconds * 1000:.3f}" for name, seconds in self.stages]
+        parts.append(f"total;dur={(time.perf_counter() - self.started) * 1000:.3f}")
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[StageTimer]] = ContextVar("stage_timer", default=None)
+
+
+def mark_stage(name: str) -> None:
+    """End the current stage of the request being timed, if any."""
+    timer = _current.get()
+    if timer is not None:
+        timer.mark(name)
+
+
+@contextmanager
+def collect_stages() -> Iterator[StageTimer]:
+    """Time the stages marked inside the block, outside of any request (used by the benchmarks)."""
+    timer = StageTimer()
+    token = _current.set(timer)
+    try:
+        yield timer
+    finally:
+        _current.reset(token)
+
+
+class StageHistograms:
+    """Cumulative-bucket histograms of stage durations per (route, stage)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        # (route, stage) -> [count per bucket (last one is +Inf), sum of seconds]
+        self._series: Dict[Tuple[str, str], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, route: str, stage: str, seconds: float) -> None:
+        series = self._series.get((route, stage))
+        if series is None:
+            series = self._series[(route, stage)] = ([0] * (len(self.buckets) + 1), [0.0])
+        series[0][bisect_left(self.buckets, seconds)] += 1
+        series[1][0] += seconds
+
+    def render(self) -> str:
+        lines = [
+            "# HELP server_timing_stage_seconds Time spent in each stage of a request.",
+            "# TYPE server_timing_stage_seconds histogram",
+        ]
+        bounds = [repr(bound) for bound in self.buckets] + ["+Inf"]
+        for (route, stage), (counts, total) in sorted(self._series.items()):
+            labels = f'route="{route}",stage="{stage}"'
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'server_timing_stage_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"server_timing_stage_seconds_sum{{{labels}}} {total[0]}")
+            lines.append(f"server_timing_stage_seconds_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+histograms = StageHistograms()
+
+
+class ServerTimingMiddleware:
+    """ASGI middleware adding a Server-Timing header built from the request's marked stages."""
+
+    def __init__(self, app: ASGIApp, histograms: Optional[StageHistograms] = None):
+        self.app = app
+        self.histograms = histograms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = StageTimer()
+        token = _current.set(timer)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Streamed bodies are still being produced; their stages end here
+                MutableHeaders(scope=message).append("Server-Timing", timer.header())
+                if self.histograms is not None:
+                    self._observe(scope, timer)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+
+    def _observe(self, scope: Scope, timer: StageTimer) -> None:
+        # The route template keeps user ids out of the label values
+        route = getattr(scope.get("route"), "path", None) or scope["path"]
+        for stage, seconds in timer.totals().items():
+            self.histograms.observe(route, stage, seconds)
+        self.histograms.observe(route, "total", time.perf_counter() - timer.started)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return histograms.render()
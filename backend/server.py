@@ -1,8 +1,17 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routers import greedy_scheduler
+from database import create_tables, session
+from routers import greedy_scheduler, priority_queue, topological_sort, dynamic_programming, parallel_scheduler, efficient_selection, response_cache, timing
 
-app = FastAPI(title="Task Scheduler API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Creates missing tables only, so a fresh local SQLite file works out of the box
+    await create_tables(session.engine)
+    yield
+    await session.engine.dispose()
+
+app = FastAPI(title="Task Scheduler API", lifespan=lifespan)
 
 # Configure CORS for frontend polling
 app.add_middleware(
@@ -15,6 +24,21 @@ app.add_middleware(
 
 # Include the greedy scheduler router at /api/greedy
 app.include_router(greedy_scheduler.router, prefix="/api", tags=["scheduling"])
+app.include_router(priority_queue.router, prefix="/api", tags=["scheduling"])
+app.include_router(topological_sort.router, prefix="/api", tags=["scheduling"])
+app.include_router(dynamic_programming.router, prefix="/api", tags=["scheduling"])
+app.include_router(parallel_scheduler.router, prefix="/api", tags=["scheduling"])
+app.include_router(efficient_selection.router, prefix="/api", tags=["scheduling"])
+app.include_router(response_cache.router, prefix="/api", tags=["cache"])
+
+# Per-stage Server-Timing headers and histograms, off unless configured
+if timing.SERVER_TIMING:
+    app.add_middleware(
+        timing.ServerTimingMiddleware,
+        histograms=timing.histograms if timing.SERVER_TIMING_METRICS else None,
+    )
+    if timing.SERVER_TIMING_METRICS:
+        app.include_router(timing.router, prefix="/api", tags=["metrics"])
 
 if __name__ == "__main__":
     import uvicorn
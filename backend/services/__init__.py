@@ -0,0 +1,3 @@
+"""
+Services that keep stored tasks and the scheduling caches in sync.
+"""
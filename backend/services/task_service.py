@@ -1,59 +1,233 @@
-from typing import List, Optional
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from datetime import datetime
 from uuid import UUID
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
-from ..database.models import Task, TaskDependency
-from ..routers.priority_queue import greedy_job_scheduling, activity_selection
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.models import Task, TaskDependency
+from routers.priority_queue import best_schedule, prepare_tasks
+from routers.models import Task as ScheduleTask
+from routers.schedule_cache import ScheduleCache, UserSchedule, schedule_cache as served_schedules
+from routers.cache import LRUCache
+from routers.topological_sort import CycleError, TaskGraph, graph_cache as served_graphs
+from routers.response_cache import TaskVersions, task_versions
+from routers.timing import mark_stage
+
+# Energy level given to stored tasks, which do not record one
+STORED_TASK_ENERGY = "medium"
+
+def importance_priority(importance: int) -> str:
+    """The scheduler priority level of a stored importance (1 to 3)."""
+    if importance >= 3:
+        return "high"
+    elif importance == 2:
+        return "medium"
+    else:
+        return "low"
+
+def to_schedule_task(task: Task) -> ScheduleTask:
+    """Map a stored task onto the greedy scheduler's Task model."""
+    return ScheduleTask(
+        id=str(task.id),
+        name=task.name,
+        priority=importance_priority(task.importance),
+        time_estimate=task.duration,
+        energy_level=STORED_TASK_ENERGY,
+        due_date=task.deadline,
+    )
 
 class TaskService:
-    def __init__(self, db: Session):
+    def __init__(
+        self,
+        db: AsyncSession,
+        schedule_cache: Optional[ScheduleCache] = served_schedules,
+        graph_cache: Optional[LRUCache[TaskGraph]] = served_graphs,
+        versions: TaskVersions = task_versions,
+    ):
         self.db = db
+        # Cached per-user greedy schedules of stored tasks (by default those GET
+        # /api/greedy/users/{user_id} serves) are patched in place on every
+        # mutation; None disables patching
+        self.schedule_cache = schedule_cache
+        # Cached dependency graphs (by default those /api/topological-sort/users serves)
+        # take new edges incrementally; other edits drop them
+        self.graph_cache = graph_cache
+        # Bumped on every mutation so cached responses for the user stop matching
+        self.versions = versions
 
     async def create_task(self, user_id: UUID, task_data: dict) -> Task:
-        task = Task(
-            user_id=user_id,
-            name=task_data["name"],
-            importance=task_data["importance"],
-            duration=task_data["duration"],
-            deadline=task_data["deadline"]
-        )
-        self.db.add(task)
-        self.db.commit()
-        self.db.refresh(task)
-        return task
+        return (await self.create_tasks(user_id, [task_data]))[0]
+
+    async def create_tasks(self, user_id: UUID, tasks_data: Sequence[dict]) -> List[Task]:
+        """Insert all tasks in one batched INSERT and commit."""
+        tasks = [
+            Task(
+                user_id=user_id,
+                name=task_data["name"],
+                importance=task_data["importance"],
+                duration=task_data["duration"],
+                deadline=task_data["deadline"]
+            )
+            for task_data in tasks_data
+        ]
+        self.db.add_all(tasks)
+        await self.db.commit()
+        if self.schedule_cache is not None:
+            for task in tasks:
+                self.schedule_cache.add_task(task.user_id, to_schedule_task(task))
+        self._invalidate(task.user_id for task in tasks)
+        return tasks
 
     async def get_user_tasks(self, user_id: UUID) -> List[Task]:
-        return self.db.query(Task).filter(Task.user_id == user_id).all()
+        return list(await self.db.scalars(select(Task).where(Task.user_id == user_id)))
 
-    async def update_task(self, task_id: UUID, task_data: dict) -> Task:
-        task = self.db.query(Task).filter(Task.id == task_id).first()
-        if not task:
+    async def get_tasks(self, task_ids: Iterable[UUID]) -> Dict[UUID, Task]:
+        """Load tasks by id in one query; raises 404 if any is missing."""
+        task_ids = set(task_ids)
+        tasks = {task.id: task for task in await self.db.scalars(select(Task).where(Task.id.in_(task_ids)))}
+        if len(tasks) != len(task_ids):
             raise HTTPException(status_code=404, detail="Task not found")
-        
-        for key, value in task_data.items():
-            setattr(task, key, value)
-        
-        self.db.commit()
-        self.db.refresh(task)
-        return task
+        return tasks
+
+    async def update_task(self, task_id: UUID, task_data: dict) -> Task:
+        return (await self.update_tasks({task_id: task_data}))[0]
+
+    async def update_tasks(self, updates: Dict[UUID, dict]) -> List[Task]:
+        """
+        Apply {task_id: fields} in one SELECT and one commit. Rows changing
+        the same columns are flushed as a single batched UPDATE.
+        """
+        tasks = await self.get_tasks(updates)
+        for task_id, task_data in updates.items():
+            for key, value in task_data.items():
+                setattr(tasks[task_id], key, value)
+
+        await self.db.commit()
+        if self.schedule_cache is not None:
+            for task_id in updates:
+                task = tasks[task_id]
+                # Completed tasks stay out of the schedule whatever else this update changed
+                if task.status == "completed":
+                    self.schedule_cache.complete_task(task.user_id, str(task.id))
+                else:
+                    self.schedule_cache.update_task(task.user_id, to_schedule_task(task))
+        self._invalidate(task.user_id for task in tasks.values())
+        return [tasks[task_id] for task_id in updates]
 
     async def delete_task(self, task_id: UUID) -> None:
-        task = self.db.query(Task).filter(Task.id == task_id).first()
+        task = await self.db.get(Task, task_id)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        self.db.delete(task)
-        self.db.commit()
+        await self.db.delete(task)
+        await self.db.commit()
+        if self.schedule_cache is not None:
+            self.schedule_cache.remove_task(task.user_id, str(task.id))
+        self._invalidate([task.user_id])
 
     async def add_dependency(self, task_id: UUID, dependency_id: UUID) -> None:
-        dependency = TaskDependency(task_id=task_id, dependency_id=dependency_id)
-        self.db.add(dependency)
-        self.db.commit()
+        await self.add_dependencies([(task_id, dependency_id)])
+
+    async def add_dependencies(self, pairs: Sequence[Tuple[UUID, UUID]]) -> None:
+        """
+        Store (task_id, dependency_id) edges in one batched INSERT. Cached
+        graphs take the edges first, so a batch that would close a cycle is
+        rejected before anything is written; if the batch is not stored, every
+        graph that took some of its edges is dropped.
+        """
+        tasks = await self.get_tasks(task_id for task_id, _ in pairs)
+        touched = set()
+        try:
+            if self.graph_cache is not None:
+                for task_id, dependency_id in pairs:
+                    user_key = str(tasks[task_id].user_id)
+                    graph = self.graph_cache.get(user_key)
+                    if graph is None:
+                        continue
+                    touched.add(user_key)
+                    try:
+                        graph.add_edge(str(dependency_id), str(task_id))
+                    except CycleError as e:
+                        raise HTTPException(status_code=422, detail={"message": "Dependency cycle detected", "cycle": e.cycle})
+                    except KeyError:
+                        self.graph_cache.pop(user_key)
+
+            self.db.add_all(
+                TaskDependency(task_id=task_id, dependency_id=dependency_id)
+                for task_id, dependency_id in pairs
+            )
+            await self.db.commit()
+        except BaseException:
+            # Also on cancellation: the graphs hold edges that were never stored
+            for user_key in touched:
+                self.graph_cache.pop(user_key)
+            raise
+        for user_id in {task.user_id for task in tasks.values()}:
+            self.versions.bump(user_id)
+
+    def _invalidate(self, user_ids: Iterable[UUID]) -> None:
+        """Drop cached graphs and cached responses of every user whose tasks changed."""
+        for user_id in set(user_ids):
+            if self.graph_cache is not None:
+                self.graph_cache.pop(str(user_id))
+            self.versions.bump(user_id)
+
+    async def get_dependency_edges(self, user_id: UUID) -> List[tuple]:
+        """All (task_id, dependency_id) pairs of the user's tasks, in one query."""
+        result = await self.db.execute(
+            select(TaskDependency.task_id, TaskDependency.dependency_id)
+            .join(Task, Task.id == TaskDependency.task_id)
+            .where(Task.user_id == user_id)
+        )
+        return [tuple(row) for row in result]
+
+    async def get_greedy_schedule(self, user_id: UUID) -> dict:
+        """Weighted greedy schedule of the user's open tasks, served from the cache when warm."""
+        schedule = self.schedule_cache.get(user_id) if self.schedule_cache is not None else None
+        if schedule is None:
+            tasks = [
+                to_schedule_task(task)
+                for task in await self.get_user_tasks(user_id)
+                if task.status != "completed"
+            ]
+            if self.schedule_cache is not None:
+                schedule = self.schedule_cache.load(user_id, tasks)
+            else:
+                schedule = UserSchedule(tasks)
+        return schedule.snapshot(datetime.now())
+
+    async def get_topological_schedule(self, user_id: UUID) -> dict:
+        """Dependency-ordered schedule with critical-path times, served from the cache when warm."""
+        graph = self.graph_cache.get(str(user_id)) if self.graph_cache is not None else None
+        if graph is None:
+            tasks = [to_schedule_task(task) for task in await self.get_user_tasks(user_id)]
+            edges = [
+                (str(dependency_id), str(task_id))
+                for task_id, dependency_id in await self.get_dependency_edges(user_id)
+            ]
+            try:
+                graph = TaskGraph.from_edges(tasks, edges)
+            except CycleError as e:
+                raise HTTPException(status_code=422, detail={"message": "Dependency cycle detected", "cycle": e.cycle})
+            if self.graph_cache is not None:
+                self.graph_cache.put(str(user_id), graph)
+        return graph.snapshot(datetime.now())
 
     async def get_schedule(self, user_id: UUID) -> dict:
-        tasks = await self.get_user_tasks(user_id)
-        
+        # Plain rows rather than Task objects: the schedule is read-only, so identity-map bookkeeping is wasted
+        tasks = await self.db.execute(
+            select(Task.id, Task.name, Task.importance, Task.duration, Task.deadline)
+            .where(Task.user_id == user_id)
+        )
+
+        # Index every dependency edge of the user's tasks, loaded in one query
+        dependencies = defaultdict(list)
+        for task_id, dependency_id in await self.get_dependency_edges(user_id):
+            dependencies[task_id].append(str(dependency_id))
+
+        mark_stage("query")
+
         # Convert database tasks to scheduling format
         scheduling_tasks = [
             {
@@ -62,25 +236,12 @@ class TaskService:
                 "importance": task.importance,
                 "duration": task.duration,
                 "deadline": task.deadline,
-                "dependencies": [
-                    str(dep.dependency_id) 
-                    for dep in self.db.query(TaskDependency)
-                    .filter(TaskDependency.task_id == task.id)
-                    .all()
-                ]
+                "dependencies": dependencies.get(task.id, [])
             }
             for task in tasks
         ]
-        
-        # Get schedules using both algorithms
-        greedy_schedule = greedy_job_scheduling(scheduling_tasks)
-        activity_schedule = activity_selection(scheduling_tasks)
-        
-        # Choose the better schedule
-        final_schedule = greedy_schedule if len(greedy_schedule) >= len(activity_schedule) else activity_schedule
-        
-        return {
-            "scheduled_tasks": final_schedule,
-            "algorithm_used": "greedy" if len(greedy_schedule) >= len(activity_schedule) else "activity_selection",
-            "total_tasks_scheduled": len(final_schedule)
-        } 
\ No newline at end of file
+
+        # Get schedules from both algorithms over the same prepared arrays
+        schedule = best_schedule(prepare_tasks(scheduling_tasks))
+        mark_stage("scheduling")
+        return schedule
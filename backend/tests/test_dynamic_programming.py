@@ -0,0 +1,83 @@
+import random
+from itertools import combinations
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from routers.dynamic_programming import deadline_knapsack, weighted_interval_scheduling
+from routers.models import DynamicProgrammingRequest
+
+
+def subsets(count):
+    for size in range(count + 1):
+        yield from combinations(range(count), size)
+
+
+def best_intervals_by_search(starts, ends, values):
+    def disjoint(chosen):
+        return all(ends[a] <= starts[b] or ends[b] <= starts[a] for a, b in combinations(chosen, 2))
+
+    return max(sum(values[i] for i in chosen) for chosen in subsets(len(starts)) if disjoint(chosen))
+
+
+def best_knapsack_by_search(durations, deadlines, values, budget):
+    def feasible(chosen):
+        used = 0
+        for i in sorted(chosen, key=lambda i: deadlines[i]):
+            used += durations[i]
+            if used > min(budget, deadlines[i]):
+                return False
+        return True
+
+    return max(sum(values[i] for i in chosen) for chosen in subsets(len(durations)) if feasible(chosen))
+
+
+def test_zero_length_interval_joins_one_ending_at_its_point():
+    selection = weighted_interval_scheduling(np.array([5, 0]), np.array([5, 5]), np.array([3, 4]))
+    assert selection.total_value == 7
+    assert sorted(selection.indices) == [0, 1]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_interval_scheduling_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    count = rng.randint(0, 9)
+    starts = [rng.randint(0, 12) for _ in range(count)]
+    # About a third of the intervals are zero-length
+    ends = [start + (0 if rng.random() < 0.3 else rng.randint(1, 6)) for start in starts]
+    values = [rng.randint(1, 10) for _ in range(count)]
+
+    selection = weighted_interval_scheduling(np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64), np.array(values, dtype=np.int64))
+
+    assert selection.total_value == best_intervals_by_search(starts, ends, values)
+    assert sum(values[i] for i in selection.indices) == selection.total_value
+    assert selection.start_offsets.tolist() == [starts[i] for i in selection.indices]
+    assert selection.end_offsets.tolist() == [ends[i] for i in selection.indices]
+    for a, b in combinations(selection.indices, 2):
+        assert ends[a] <= starts[b] or ends[b] <= starts[a]
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_deadline_knapsack_matches_exhaustive_search(seed):
+    rng = random.Random(seed)
+    count = rng.randint(0, 9)
+    budget = rng.randint(0, 120)
+    durations = [rng.randint(0, 60) for _ in range(count)]
+    deadlines = [rng.randint(-10, 150) for _ in range(count)]
+    values = [rng.randint(1, 10) for _ in range(count)]
+
+    selection = deadline_knapsack(np.array(durations, dtype=np.int64), np.array(deadlines, dtype=np.int64), np.array(values, dtype=np.int64), budget)
+
+    assert selection.total_value == best_knapsack_by_search(durations, deadlines, values, budget)
+    assert sum(values[i] for i in selection.indices) == selection.total_value
+    # Chosen tasks run back to back from the origin, each done by its deadline and the budget
+    assert selection.start_offsets.tolist() == np.cumsum([0] + [durations[i] for i in selection.indices])[:-1].tolist()
+    for i, end in zip(selection.indices, selection.end_offsets.tolist()):
+        assert end <= min(budget, deadlines[i])
+
+
+@pytest.mark.parametrize("budget", [-1, 1441, 200000])
+def test_budget_outside_one_day_is_rejected(budget):
+    with pytest.raises(ValidationError):
+        DynamicProgrammingRequest(tasks=[], budget_minutes=budget)
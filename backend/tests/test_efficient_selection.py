@@ -0,0 +1,44 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database import create_engine, create_tables, session_factory
+from routers import efficient_selection
+from services.task_service import TaskService
+
+app = FastAPI()
+app.include_router(efficient_selection.router, prefix="/api")
+client = TestClient(app)
+
+
+def test_malformed_user_id_is_rejected():
+    assert client.get("/api/efficient-selection", params={"user_id": "not-a-uuid"}).status_code == 422
+
+
+def test_user_tasks_map_importance_to_priority():
+    user_id = uuid.uuid4()
+    deadline = datetime.now() + timedelta(days=1)
+
+    async def main():
+        engine = create_engine("sqlite+aiosqlite:///:memory:")
+        await create_tables(engine)
+        try:
+            async with session_factory(engine)() as db:
+                service = TaskService(db, None, None)
+                tasks = await service.create_tasks(user_id, [
+                    {"name": f"task {importance}", "importance": importance, "duration": 90, "deadline": deadline}
+                    for importance in (1, 2, 3)
+                ])
+                await service.update_task(tasks[0].id, {"status": "completed"})
+                return await efficient_selection.get_user_tasks(db, user_id)
+        finally:
+            await engine.dispose()
+
+    rows = sorted(asyncio.run(main()), key=lambda row: row["title"])
+    assert [(row["title"], row["priority"], row["energy"], row["duration"]) for row in rows] == [
+        ("task 2", "medium", "medium", 1.5),
+        ("task 3", "high", "medium", 1.5),
+    ]
@@ -0,0 +1,109 @@
+import random
+
+import numpy as np
+import pytest
+
+from routers.parallel_scheduler import NO_DEADLINE, list_schedule
+from routers.topological_sort import CycleError
+
+
+def random_windows(rng):
+    """None (always available) or sorted, non-overlapping windows with energy levels 1..3."""
+    if rng.random() < 0.3:
+        return None
+    starts, ends, levels = [], [], []
+    cursor = 0
+    for _ in range(rng.randint(1, 4)):
+        start = cursor + rng.randint(0, 60)
+        end = start + rng.randint(0, 180)
+        starts.append(start)
+        ends.append(end)
+        levels.append(rng.randint(1, 3))
+        cursor = end
+    return starts, ends, levels
+
+
+def random_case(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 40)
+    durations = np.array([rng.randint(0, 90) for _ in range(n)], dtype=np.int64)
+    deadlines = np.array([rng.randint(0, 600) if rng.random() < 0.7 else NO_DEADLINE for _ in range(n)], dtype=np.int64)
+    energy = np.array([rng.randint(1, 3) for _ in range(n)], dtype=np.int64)
+    rank = np.array(rng.sample(range(n), n), dtype=np.int64)
+    # Edges follow a hidden order, so the graph is acyclic
+    hidden = rng.sample(range(n), n)
+    pairs = {tuple(sorted(rng.sample(range(n), 2))) for _ in range(rng.randint(0, 2 * n))} if n > 1 else set()
+    src = np.array([hidden[a] for a, _ in pairs], dtype=np.int64)
+    dst = np.array([hidden[b] for _, b in pairs], dtype=np.int64)
+    windows = [random_windows(rng) for _ in range(rng.randint(1, 4))]
+    return durations, deadlines, energy, rank, src, dst, windows
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_list_schedule_is_feasible(seed):
+    durations, deadlines, energy, rank, src, dst, windows = random_case(seed)
+    n = len(durations)
+    plan = list_schedule([str(i) for i in range(n)], durations, deadlines, energy, rank, src, dst, windows)
+
+    placed = plan.order.tolist()
+    assert sorted(placed + plan.unscheduled) == list(range(n))
+    start = dict(zip(placed, plan.start_offsets.tolist()))
+    end = dict(zip(placed, plan.end_offsets.tolist()))
+    resource = dict(zip(placed, plan.resource.tolist()))
+
+    for task in placed:
+        assert start[task] >= 0
+        assert end[task] - start[task] == durations[task]
+        calendar = windows[resource[task]]
+        if calendar is not None:
+            assert any(
+                window_start <= start[task] and end[task] <= window_end and level >= energy[task]
+                for window_start, window_end, level in zip(*calendar)
+            )
+
+    for r in range(len(windows)):
+        booked = sorted((start[task], end[task]) for task in placed if resource[task] == r)
+        for (_, previous_end), (next_start, _) in zip(booked, booked[1:]):
+            assert next_start >= previous_end
+
+    unscheduled = set(plan.unscheduled)
+    for before, after in zip(src.tolist(), dst.tolist()):
+        if before in unscheduled:
+            assert after in unscheduled
+        elif after not in unscheduled:
+            assert end[before] <= start[after]
+
+    if placed:
+        assert plan.makespan == max(end.values())
+
+
+def test_task_without_a_fitting_window_blocks_its_dependents():
+    windows = [([0], [60], [1])]  # one low-energy hour
+    plan = list_schedule(
+        ["a", "b", "c"],
+        durations=np.array([30, 30, 30], dtype=np.int64),
+        deadlines=np.array([NO_DEADLINE] * 3, dtype=np.int64),
+        energy=np.array([3, 1, 1], dtype=np.int64),
+        rank=np.arange(3, dtype=np.int64),
+        src=np.array([0], dtype=np.int64),
+        dst=np.array([1], dtype=np.int64),
+        windows=windows,
+    )
+    assert plan.order.tolist() == [2]
+    assert sorted(plan.unscheduled) == [0, 1]
+
+
+def test_dependency_cycle_raises():
+    with pytest.raises(CycleError) as info:
+        list_schedule(
+            ["a", "b", "c"],
+            durations=np.array([10, 10, 10], dtype=np.int64),
+            deadlines=np.array([NO_DEADLINE] * 3, dtype=np.int64),
+            energy=np.ones(3, dtype=np.int64),
+            rank=np.arange(3, dtype=np.int64),
+            src=np.array([0, 1, 2], dtype=np.int64),
+            dst=np.array([1, 2, 0], dtype=np.int64),
+            windows=[None, None],
+        )
+    cycle = info.value.cycle
+    assert cycle[0] == cycle[-1] and sorted(cycle[:-1]) == ["a", "b", "c"]
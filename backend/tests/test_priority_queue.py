@@ -0,0 +1,101 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from routers.priority_queue import SLOT_MINUTES, best_schedule, greedy_job_scheduling, prepare_tasks
+
+ORIGIN = datetime(2025, 1, 6, 9, 0)
+
+
+def random_tasks(rng, count):
+    return [
+        {
+            "id": f"t{i}",
+            "name": f"task {i}",
+            "importance": rng.randint(1, 3),
+            "duration": rng.randint(1, 90),
+            "deadline": ORIGIN + timedelta(minutes=rng.randint(0, 240)) if rng.random() < 0.8 else None,
+        }
+        for i in range(count)
+    ]
+
+
+def assert_no_overlaps(scheduled):
+    windows = sorted((task["scheduled_start"], task["scheduled_end"]) for task in scheduled)
+    for (_, previous_end), (start, _) in zip(windows, windows[1:]):
+        assert start >= previous_end
+
+
+def test_greedy_windows_are_contiguous():
+    # b would otherwise take slots 1 and 3 around a's slot 2
+    tasks = [
+        {"id": "a", "name": "a", "importance": 3, "duration": 15, "deadline": ORIGIN + timedelta(minutes=30)},
+        {"id": "b", "name": "b", "importance": 2, "duration": 30, "deadline": ORIGIN + timedelta(minutes=45)},
+    ]
+    scheduled = greedy_job_scheduling(prepare_tasks(tasks, ORIGIN))
+    assert {task["id"]: (task["scheduled_start"], task["scheduled_end"]) for task in scheduled} == {
+        "a": (ORIGIN + timedelta(minutes=15), ORIGIN + timedelta(minutes=30)),
+    }
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_greedy_windows_do_not_overlap(seed):
+    rng = random.Random(seed)
+    prepared = prepare_tasks(random_tasks(rng, rng.randint(1, 25)), ORIGIN)
+    scheduled = greedy_job_scheduling(prepared)
+
+    assert_no_overlaps(scheduled)
+    horizon_end = ORIGIN + timedelta(minutes=prepared.horizon * SLOT_MINUTES)
+    for task in scheduled:
+        slots = -(-max(task["duration"], 1) // SLOT_MINUTES)
+        assert task["scheduled_end"] - task["scheduled_start"] == timedelta(minutes=slots * SLOT_MINUTES)
+        assert task["scheduled_start"] >= ORIGIN
+        assert task["scheduled_end"] <= (task["deadline"] or horizon_end)
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_best_schedule_does_not_overlap(seed):
+    rng = random.Random(seed)
+    schedule = best_schedule(prepare_tasks(random_tasks(rng, rng.randint(1, 25)), ORIGIN))
+    assert_no_overlaps(schedule["scheduled_tasks"])
+
+
+def interleaved_tasks(count):
+    """`count` one-slot tasks on every other slot, then `count` two-slot tasks that fit none of the gaps left."""
+    tasks = [
+        {"id": f"a{i}", "name": "", "importance": 3, "duration": SLOT_MINUTES,
+         "deadline": ORIGIN + timedelta(minutes=(2 * i + 1) * SLOT_MINUTES)}
+        for i in range(count)
+    ]
+    tasks += [
+        {"id": f"b{i}", "name": "", "importance": 1, "duration": 2 * SLOT_MINUTES,
+         "deadline": ORIGIN + timedelta(minutes=2 * count * SLOT_MINUTES)}
+        for i in range(count)
+    ]
+    return tasks
+
+
+def scheduling_seconds(tasks):
+    prepared = prepare_tasks(tasks, ORIGIN)
+    started = time.perf_counter()
+    scheduled = greedy_job_scheduling(prepared)
+    return time.perf_counter() - started, scheduled
+
+
+def test_greedy_scales_to_tens_of_thousands_of_tasks():
+    small, _ = scheduling_seconds(interleaved_tasks(2500))
+    large, scheduled = scheduling_seconds(interleaved_tasks(25000))
+    assert len(scheduled) == 25000
+    # 10x the tasks: about 10x the time when each task costs O(log S), 100x when it rescans the gaps
+    assert large < 30 * small
+
+    rng = random.Random(0)
+    tasks = random_tasks(rng, 50000)
+    for task in tasks:
+        if task["deadline"] is not None:
+            task["deadline"] = ORIGIN + timedelta(minutes=rng.randint(0, 50000 * SLOT_MINUTES))
+    seconds, scheduled = scheduling_seconds(tasks)
+    assert_no_overlaps(scheduled)
+    assert seconds < 5
@@ -0,0 +1,32 @@
+from routers.response_cache import TaskVersions
+
+
+def test_versions_keep_only_recent_users():
+    versions = TaskVersions(maxsize=4)
+    for user in range(100):
+        versions.bump(f"user-{user}")
+    assert len(versions._versions) == 4
+
+
+def test_evicted_user_never_gets_a_version_of_an_older_task_set():
+    versions = TaskVersions(maxsize=2)
+    seen = {versions.get("a")}
+    versions.bump("a")
+    seen.add(versions.get("a"))
+    # Evict "a" while other users change
+    versions.bump("b")
+    versions.bump("c")
+    assert versions._versions.peek("a") is None
+
+    current = versions.get("a")
+    assert current not in seen
+    # Unchanged since, so later reads keep matching the responses cached under it
+    assert versions.get("a") == current
+
+
+def test_untracked_users_share_a_stable_version_until_they_change():
+    versions = TaskVersions()
+    first = versions.get("a")
+    versions.bump("b")
+    assert versions.get("a") == first
+    assert versions.bump("a") > first
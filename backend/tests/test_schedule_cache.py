@@ -0,0 +1,112 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from database import create_engine, create_tables, get_session, session_factory
+from routers import greedy_scheduler
+from routers.models import Task
+from routers.schedule_cache import UserSchedule, schedule_cache
+from services.task_service import TaskService
+
+app = FastAPI()
+app.include_router(greedy_scheduler.router, prefix="/api")
+client = TestClient(app)
+
+
+def task(task_id, minutes):
+    return {"id": task_id, "name": task_id, "priority": "medium", "time_estimate": minutes, "energy_level": "medium"}
+
+
+def test_user_schedule_rejects_duplicate_ids():
+    with pytest.raises(ValueError, match="Duplicate task id 'a'"):
+        UserSchedule([Task(**task("a", 10)), Task(**task("a", 20))])
+
+
+def test_loading_duplicate_ids_is_rejected_and_keeps_previous_schedule():
+    user = f"user-{uuid.uuid4()}"
+    assert client.put(f"/api/greedy/users/{user}", json={"tasks": [task("a", 10)]}).status_code == 200
+
+    response = client.put(f"/api/greedy/users/{user}", json={"tasks": [task("a", 10), task("a", 20)]})
+    assert response.status_code == 422
+
+    assert client.delete(f"/api/greedy/users/{user}/tasks/a").status_code == 200
+    schedule = client.get(f"/api/greedy/users/{user}").json()
+    assert schedule["scheduled_tasks"] == [] and schedule["total_duration"] == 0
+
+
+def run_with_stored_tasks(tmp_path, scenario):
+    """Run `scenario(http, sessions)` with the app reading a fresh SQLite file through `sessions`."""
+    async def main():
+        engine = create_engine(f"sqlite+aiosqlite:///{tmp_path / 'tasks.db'}")
+        await create_tables(engine)
+        sessions = session_factory(engine)
+
+        async def session_override():
+            async with sessions() as db:
+                yield db
+
+        app.dependency_overrides[get_session] = session_override
+        try:
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as http:
+                return await scenario(http, sessions)
+        finally:
+            app.dependency_overrides.clear()
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def stored_task(name):
+    return {"name": name, "importance": 3, "duration": 30, "deadline": datetime.now() + timedelta(days=1)}
+
+
+def test_get_serves_stored_tasks_without_a_put(tmp_path):
+    user_id = uuid.uuid4()
+
+    async def scenario(http, sessions):
+        async with sessions() as db:
+            await TaskService(db).create_tasks(user_id, [stored_task("write"), stored_task("review")])
+        first = await http.get(f"/api/greedy/users/{user_id}")
+        async with sessions() as db:
+            await TaskService(db).create_task(user_id, stored_task("ship"))
+        # Upper case ids name the same stored user
+        second = await http.get(f"/api/greedy/users/{str(user_id).upper()}")
+        return first, second
+
+    try:
+        first, second = run_with_stored_tasks(tmp_path, scenario)
+    finally:
+        schedule_cache.evict(user_id)
+    assert first.status_code == 200
+    assert sorted(task["name"] for task in first.json()["scheduled_tasks"]) == ["review", "write"]
+    assert sorted(task["name"] for task in second.json()["scheduled_tasks"]) == ["review", "ship", "write"]
+
+
+def test_put_task_list_is_not_patched_by_stored_task_changes(tmp_path):
+    user_id = uuid.uuid4()
+
+    async def scenario(http, sessions):
+        await http.put(f"/api/greedy/users/{user_id}", json={"tasks": [task("a", 10)]})
+        async with sessions() as db:
+            await TaskService(db).create_task(user_id, stored_task("stored"))
+        served = (await http.get(f"/api/greedy/users/{user_id}")).json()
+        async with sessions() as db:
+            stored = await TaskService(db).get_greedy_schedule(user_id)
+        return served, stored
+
+    try:
+        served, stored = run_with_stored_tasks(tmp_path, scenario)
+    finally:
+        schedule_cache.evict(user_id)
+        greedy_scheduler.client_schedules.evict(str(user_id))
+    assert [task["id"] for task in served["scheduled_tasks"]] == ["a"]
+    assert [task["name"] for task in stored["scheduled_tasks"]] == ["stored"]
+
+
+def test_get_without_put_or_stored_user_id_is_not_found():
+    assert client.get("/api/greedy/users/not-a-uuid").status_code == 404
@@ -0,0 +1,152 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from database import create_engine, create_tables, session_factory
+from routers.cache import LRUCache
+from routers.response_cache import TaskVersions
+from routers.schedule_cache import ScheduleCache, schedule_cache
+from routers.topological_sort import graph_cache
+from services.task_service import TaskService
+
+
+def run_with_service(scenario, shared_caches=False):
+    """Run `scenario(service)` against a fresh in-memory database, with private caches unless `shared_caches`."""
+    async def main():
+        engine = create_engine("sqlite+aiosqlite:///:memory:")
+        await create_tables(engine)
+        try:
+            async with session_factory(engine)() as db:
+                if shared_caches:
+                    service = TaskService(db)
+                else:
+                    service = TaskService(db, ScheduleCache(), LRUCache(8), TaskVersions())
+                return await scenario(service)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(main())
+
+
+def new_tasks(count):
+    deadline = datetime.now() + timedelta(days=1)
+    return [{"name": f"task {i}", "importance": 2, "duration": 30, "deadline": deadline} for i in range(count)]
+
+
+def test_editing_completed_task_keeps_it_out_of_cached_schedule():
+    user_id = uuid.uuid4()
+
+    async def scenario(service):
+        tasks = await service.create_tasks(user_id, new_tasks(3))
+        await service.get_greedy_schedule(user_id)  # warms the cache
+        await service.update_task(tasks[0].id, {"status": "completed"})
+        await service.update_task(tasks[0].id, {"name": "renamed"})
+        cached = service.schedule_cache.get(user_id)
+        return [task["id"] for task in cached.snapshot(datetime.now())["scheduled_tasks"]], tasks
+
+    scheduled, tasks = run_with_service(scenario)
+    assert sorted(scheduled) == sorted(str(task.id) for task in tasks[1:])
+
+
+def test_cached_schedule_matches_rebuild_after_edits():
+    user_id = uuid.uuid4()
+
+    async def scenario(service):
+        tasks = await service.create_tasks(user_id, new_tasks(4))
+        await service.get_greedy_schedule(user_id)
+        await service.create_task(user_id, new_tasks(1)[0])
+        await service.update_tasks({tasks[1].id: {"duration": 90}, tasks[2].id: {"status": "completed"}})
+        await service.delete_task(tasks[3].id)
+        cached = await service.get_greedy_schedule(user_id)
+        service.schedule_cache.evict(user_id)
+        rebuilt = await service.get_greedy_schedule(user_id)
+        return cached, rebuilt
+
+    cached, rebuilt = run_with_service(scenario)
+    strip = lambda schedule: [(task["id"], task["time_estimate"]) for task in schedule["scheduled_tasks"]]
+    assert strip(cached) == strip(rebuilt)
+    assert cached["total_duration"] == rebuilt["total_duration"]
+
+
+def test_default_service_patches_schedule_served_by_router():
+    user_id = uuid.uuid4()
+
+    async def scenario(service):
+        await service.create_tasks(user_id, new_tasks(2))
+        await service.get_greedy_schedule(user_id)
+        added = await service.create_task(user_id, new_tasks(1)[0])
+        try:
+            return str(added.id) in schedule_cache.get(str(user_id))
+        finally:
+            schedule_cache.evict(user_id)
+
+    assert run_with_service(scenario, shared_caches=True)
+
+
+def test_default_service_checks_cycles_against_served_graph():
+    user_id = uuid.uuid4()
+
+    async def scenario(service):
+        tasks = await service.create_tasks(user_id, new_tasks(3))
+        await service.add_dependency(tasks[1].id, tasks[0].id)
+        await service.get_topological_schedule(user_id)
+        try:
+            await service.add_dependency(tasks[2].id, tasks[1].id)
+            graph = graph_cache.get(str(user_id))
+            order = [graph.ids[node] for node in graph.order]
+            try:
+                await service.add_dependency(tasks[0].id, tasks[2].id)
+            except HTTPException as e:
+                return order, e.status_code, len(await service.get_dependency_edges(user_id)), tasks
+        finally:
+            graph_cache.pop(str(user_id))
+
+    order, status, stored_edges, tasks = run_with_service(scenario, shared_caches=True)
+    assert order == [str(task.id) for task in tasks]
+    assert status == 422
+    assert stored_edges == 2
+
+
+def test_rejected_batch_drops_every_graph_that_took_its_edges():
+    first_user, second_user = uuid.uuid4(), uuid.uuid4()
+
+    async def scenario(service):
+        first = await service.create_tasks(first_user, new_tasks(2))
+        second = await service.create_tasks(second_user, new_tasks(2))
+        await service.add_dependency(second[1].id, second[0].id)
+        await service.get_topological_schedule(first_user)
+        await service.get_topological_schedule(second_user)
+        # The first user's edge is fine, the second user's closes a cycle
+        try:
+            await service.add_dependencies([(first[1].id, first[0].id), (second[0].id, second[1].id)])
+        except HTTPException as e:
+            status = e.status_code
+        cached = service.graph_cache.get(str(first_user))
+        schedule = await service.get_topological_schedule(first_user)
+        return status, cached, schedule, await service.get_dependency_edges(first_user)
+
+    status, cached, schedule, stored_edges = run_with_service(scenario)
+    assert status == 422
+    assert cached is None
+    assert stored_edges == []
+    assert schedule["makespan"] == 30  # the two 30-minute tasks still run side by side
+
+
+def test_failed_commit_drops_graphs_that_took_the_batch():
+    user_id = uuid.uuid4()
+
+    async def scenario(service):
+        tasks = await service.create_tasks(user_id, new_tasks(3))
+        await service.add_dependency(tasks[1].id, tasks[0].id)
+        await service.get_topological_schedule(user_id)
+        # Storing an existing edge again violates the primary key at commit
+        with pytest.raises(IntegrityError):
+            await service.add_dependencies([(tasks[2].id, tasks[0].id), (tasks[1].id, tasks[0].id)])
+        await service.db.rollback()
+        return service.graph_cache.get(str(user_id))
+
+    assert run_with_service(scenario) is None
@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pytest
+
+from routers.models import Task
+from routers.topological_sort import CycleError, TaskGraph
+
+
+def make_tasks(rng, count):
+    return [
+        Task(
+            id=f"t{i}",
+            name=f"task {i}",
+            priority=rng.choice(["high", "medium", "low"]),
+            time_estimate=rng.randint(0, 60),
+            energy_level=rng.choice(["high", "medium", "low"]),
+        )
+        for i in range(count)
+    ]
+
+
+def random_dag_edges(rng, count, probability):
+    """(before, after) id pairs that respect a hidden random order, so they never form a cycle."""
+    hidden = list(range(count))
+    rng.shuffle(hidden)
+    return [
+        (f"t{hidden[i]}", f"t{hidden[j]}")
+        for i in range(count) for j in range(i + 1, count)
+        if rng.random() < probability
+    ]
+
+
+def assert_matches_rebuild(graph, tasks, edges):
+    rebuilt = TaskGraph.from_edges(tasks, edges)
+    assert np.array_equal(graph.earliest_start, rebuilt.earliest_start)
+    assert np.array_equal(graph.latest_start, rebuilt.latest_start)
+    assert graph.makespan == rebuilt.makespan
+    position = {graph.ids[node]: i for i, node in enumerate(graph.order)}
+    assert sorted(position.values()) == list(range(len(tasks)))
+    assert all(position[before] < position[after] for before, after in edges)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_add_edge_matches_full_rebuild(seed):
+    rng = random.Random(seed)
+    count = rng.randint(1, 25)
+    tasks = make_tasks(rng, count)
+    edges = random_dag_edges(rng, count, rng.choice([0.05, 0.15, 0.3]))
+    rng.shuffle(edges)
+    initial = rng.randint(0, len(edges))
+
+    graph = TaskGraph.from_edges(tasks, edges[:initial])
+    for added in range(initial, len(edges)):
+        graph.add_edge(*edges[added])
+        assert_matches_rebuild(graph, tasks, edges[:added + 1])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_add_edge_rejects_cycles_without_changing_graph(seed):
+    rng = random.Random(seed)
+    count = rng.randint(2, 20)
+    tasks = make_tasks(rng, count)
+    edges = random_dag_edges(rng, count, 0.3)
+    graph = TaskGraph.from_edges(tasks, edges)
+    for before, after in edges[:5]:
+        with pytest.raises(CycleError):
+            graph.add_edge(after, before)
+        assert_matches_rebuild(graph, tasks, edges)
+    with pytest.raises(CycleError):
+        graph.add_edge("t0", "t0")
+
+
+def test_from_edges_reports_cycle():
+    tasks = make_tasks(random.Random(0), 3)
+    with pytest.raises(CycleError) as error:
+        TaskGraph.from_edges(tasks, [("t0", "t1"), ("t1", "t2"), ("t2", "t0")])
+    cycle = error.value.cycle
+    assert cycle[0] == cycle[-1] and sorted(cycle[:-1]) == ["t0", "t1", "t2"]